@@ -1,7 +1,8 @@
 from importlib import metadata
 
+from mmemoji.client import EmojiClient, EmojiResult
 from mmemoji.emoji import Emoji
 
-__all__ = ["Emoji"]
+__all__ = ["Emoji", "EmojiClient", "EmojiResult"]
 __version__ = metadata.version(__name__)
 __summary__ = metadata.metadata(__name__)["Summary"]
@@ -0,0 +1,225 @@
+"""Batch operations on Mattermost custom Emojis.
+
+:class:`EmojiClient` resolves the existing Emojis upfront,
+runs the API calls concurrently and collects errors per item
+instead of stopping at the first one.
+"""
+
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypedDict, TypeVar
+
+from httpx import HTTPError
+from mattermostautodriver import TypedDriver as Mattermost
+
+from mmemoji.emoji import Emoji
+
+if sys.version_info < (3, 11):
+    from typing_extensions import NotRequired
+else:
+    from typing import NotRequired
+
+T = TypeVar("T")
+
+
+class EmojiResult(TypedDict):
+    """Outcome of an operation on a single Emoji"""
+
+    #: Emoji name
+    name: str
+    #: Emoji metadata, empty if the Emoji does not exist
+    metadata: dict[str, Any]
+    #: ``True`` if the Emoji was created, deleted or downloaded
+    done: bool
+    #: Error raised by the operation, if any
+    error: NotRequired[Exception]
+    #: Emoji image, only for downloads
+    image: NotRequired[bytes]
+
+
+class EmojiClient:
+    """Create, delete and download custom Emojis in bulk."""
+
+    def __init__(
+        self,
+        mattermost: Mattermost,
+        max_workers: int = 8,
+        lookup_threshold: int = 200,
+    ) -> None:
+        """Init EmojiClient class with a Mattermost client instance.
+
+        Parameters
+        ----------
+        mattermost : :obj:`mattermostautodriver.Driver`
+            an instance of `mattermostautodriver`_
+        max_workers : int
+            maximum number of concurrent API calls
+        lookup_threshold : int
+            maximum number of Emojis to resolve with individual lookups,
+            above it, the Emoji list is walked instead
+        """
+        self._mm = mattermost
+        self.max_workers = max_workers
+        self.lookup_threshold = lookup_threshold
+
+    def iter_all(self, since: int = 0) -> Iterator[dict[str, Any]]:
+        """Iterate over all custom Emojis.
+
+        Parameters
+        ----------
+        since: int
+            Only yield Emojis created or updated after this timestamp
+            (milliseconds since the epoch).
+
+        Yields
+        ------
+        :obj:`dict`
+            Emoji metadata
+        """
+        return Emoji.iterate(self._mm, since=since)
+
+    def resolve(self, names: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Retrieve the metadata of many Emojis at once.
+
+        Parameters
+        ----------
+        names : :obj:`list` of str
+            Emoji names or file paths
+
+        Returns
+        -------
+        :obj:`dict` of (str: :obj:`dict`)
+            Emoji metadata by sanitized name,
+            empty if the Emoji does not exist
+        """
+        wanted = sorted({Emoji.sanitize_name(name) for name in names})
+        resolved: dict[str, dict[str, Any]] = {name: {} for name in wanted}
+        if len(wanted) <= self.lookup_threshold:
+            emojis = self._map(
+                lambda name: Emoji(self._mm, name).metadata, wanted
+            )
+            resolved.update(zip(wanted, emojis, strict=True))
+            return resolved
+
+        missing = set(wanted)
+        for metadata in self.iter_all():
+            if metadata["name"] in missing:
+                resolved[metadata["name"]] = metadata
+                missing.remove(metadata["name"])
+                if not missing:
+                    break
+        return resolved
+
+    def create_many(
+        self,
+        images: Iterable[str],
+        force: bool = False,
+        no_clobber: bool = False,
+    ) -> list[EmojiResult]:
+        """Create custom Emojis from image files.
+
+        Parameters
+        ----------
+        images : :obj:`list` of str
+            image file paths, Emoji names are extracted from the filenames
+        force: bool
+            delete Emojis if they already exist
+            (ignored if ``no_clobber is ``True``)
+        no_clobber: bool
+            skip Emojis which already exist
+
+        Returns
+        -------
+        :obj:`list` of :obj:`EmojiResult`
+            Results in the same order as ``images``
+        """
+        images = list(images)
+        resolved = self.resolve(images)
+
+        def run(path: str) -> EmojiResult:
+            emoji = Emoji(self._mm, path, resolved[Emoji.sanitize_name(path)])
+
+            def create() -> bool:
+                with open(path, "rb") as image:
+                    return emoji.create(image, force, no_clobber)
+
+            return self._run(emoji, create)
+
+        return self._map(run, images)
+
+    def delete_many(
+        self, names: Iterable[str], force: bool = False
+    ) -> list[EmojiResult]:
+        """Delete custom Emojis.
+
+        Parameters
+        ----------
+        names : :obj:`list` of str
+            Emoji names or file paths
+        force: bool
+            ignore non-existent Emojis
+
+        Returns
+        -------
+        :obj:`list` of :obj:`EmojiResult`
+            Results in the same order as ``names``
+        """
+        names = list(names)
+        resolved = self.resolve(names)
+
+        def run(name: str) -> EmojiResult:
+            emoji = Emoji(self._mm, name, resolved[Emoji.sanitize_name(name)])
+            return self._run(emoji, lambda: emoji.delete(force))
+
+        return self._map(run, names)
+
+    def download_many(self, names: Iterable[str]) -> list[EmojiResult]:
+        """Download custom Emojis.
+
+        Parameters
+        ----------
+        names : :obj:`list` of str
+            Emoji names
+
+        Returns
+        -------
+        :obj:`list` of :obj:`EmojiResult`
+            Results in the same order as ``names``,
+            images are stored under the ``image`` key
+        """
+        names = list(names)
+        resolved = self.resolve(names)
+
+        def run(name: str) -> EmojiResult:
+            emoji = Emoji(self._mm, name, resolved[Emoji.sanitize_name(name)])
+            result = EmojiResult(name=emoji.name, metadata={}, done=False)
+
+            def download() -> bool:
+                result["image"] = emoji.download()
+                return True
+
+            return self._run(emoji, download, result)
+
+        return self._map(run, names)
+
+    def _map(self, func: Callable[[str], T], items: Iterable[str]) -> list[T]:
+        """Apply a function to every item concurrently, preserving order"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(func, items))
+
+    @staticmethod
+    def _run(
+        emoji: Emoji,
+        operation: Callable[[], bool],
+        result: EmojiResult | None = None,
+    ) -> EmojiResult:
+        """Run an operation on an Emoji and collect its outcome"""
+        if result is None:
+            result = EmojiResult(name=emoji.name, metadata={}, done=False)
+        try:
+            result["done"] = operation()
+        except (HTTPError, OSError) as e:
+            result["error"] = e
+        result["metadata"] = emoji.metadata
+        return result
@@ -0,0 +1,161 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any
+
+import click
+from httpx import HTTPError
+
+from mmemoji import Emoji
+from mmemoji.decorators import EmojiContext, parse_global_options
+from mmemoji.plan import REQUESTS, Operation, existing_emojis
+
+
+def load_plan(plan_file: IO[str]) -> dict[str, Any]:
+    """Read a plan saved with --save-plan"""
+    try:
+        plan = json.load(plan_file)
+    except ValueError as e:
+        raise click.ClickException(f"{plan_file.name}: Invalid plan") from e
+    if not isinstance(plan, dict) or not isinstance(
+        plan.get("operations"), list
+    ):
+        raise click.ClickException(f"{plan_file.name}: Invalid plan")
+    for n, operation in enumerate(plan["operations"], start=1):
+        if (
+            not isinstance(operation, dict)
+            or operation.get("action") not in REQUESTS
+            or not isinstance(operation.get("name"), str)
+            or (
+                operation["action"] in ("create", "overwrite")
+                and not isinstance(operation.get("path"), str)
+            )
+        ):
+            raise click.ClickException(
+                f"{plan_file.name}: Invalid operation #{n}"
+            )
+    return plan
+
+
+def check(operation: Operation, current: dict[str, Any] | None) -> str:
+    """Compare the state seen by the plan with the current state
+
+    Returns a description of the conflict, if any.
+    """
+    action = operation["action"]
+    if action == "create" and current:
+        return "emoji was created since the plan"
+    if action in ("delete", "overwrite") and "id" in operation:
+        if not current or current["id"] != operation["id"]:
+            return "emoji was deleted since the plan"
+        if Emoji.updated_at(current) != operation.get("update_at"):
+            return "emoji was updated since the plan"
+    return ""
+
+
+def apply_operation(
+    ctx: EmojiContext, operation: Operation, current: dict[str, Any]
+) -> None:
+    """Run the API calls of a planned operation"""
+    action = operation["action"]
+    emoji = Emoji(ctx.mattermost, operation["name"], current)
+    if action == "delete":
+        emoji.delete()
+    elif action in ("create", "overwrite"):
+        with open(operation["path"], "rb") as image:
+            emoji.create(image, force=True)
+
+
+def apply_operations(
+    ctx: EmojiContext,
+    operations: list[Operation],
+    current: dict[str, Any],
+    no_verify: bool,
+) -> list[dict[str, Any]]:
+    """Run the operations planned on an emoji, in the order of the plan
+
+    Operations following a failed one are not run, since they depend on it.
+    """
+    rows = []
+    for operation in operations:
+        row = {"action": operation["action"], "name": operation["name"]}
+        rows.append(row)
+        conflict = "" if no_verify else check(operation, current)
+        if conflict:
+            row["result"] = f"conflict: {conflict}"
+            continue
+        if operation["action"] in ("skip", "conflict", "missing"):
+            row["result"] = "ignored"
+            continue
+        if no_verify and "id" in operation:
+            current = {"id": operation["id"], "name": operation["name"]}
+        try:
+            apply_operation(ctx, operation, current)
+        except HTTPError as e:
+            row["result"] = f"error: {e.args[0] if e.args != () else repr(e)}"
+            break
+        except OSError as e:
+            # e.g. the image was moved since the plan
+            row["result"] = f"error: {e}"
+            break
+        row["result"] = "applied"
+        current = Emoji(ctx.mattermost, operation["name"]).metadata
+    return rows
+
+
+@click.command(help="Apply a plan saved with --save-plan")
+@click.argument("plan_file", metavar="PLAN", type=click.File("r"))
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="number of operations to run concurrently",
+)
+@click.option(
+    "--no-verify",
+    is_flag=True,
+    help="do not check that emojis are unchanged since the plan",
+)
+@parse_global_options
+def cli(
+    ctx: EmojiContext, plan_file: IO[str], workers: int, no_verify: bool
+) -> None:
+    plan = load_plan(plan_file)
+    if plan.get("url") not in (None, ctx.url.geturl()):
+        raise click.ClickException(
+            f"{plan_file.name}: Plan was made for {plan['url']}"
+        )
+
+    # Operations on the same emoji depend on each other,
+    # they run sequentially in the order of the plan
+    groups: dict[str, list[Operation]] = {}
+    for operation in plan["operations"]:
+        groups.setdefault(operation["name"], []).append(operation)
+
+    try:
+        existing = {} if no_verify else existing_emojis(ctx.mattermost)
+    except HTTPError as e:
+        raise click.ClickException(
+            e.args[0] if e.args != () else repr(e)
+        ) from e
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                apply_operations,
+                ctx,
+                operations,
+                existing.get(name, {}),
+                no_verify,
+            )
+            for name, operations in groups.items()
+        ]
+        results = [row for future in futures for row in future.result()]
+
+    ctx.print_dict(results)
+    failures = sum(r["result"] not in ("applied", "ignored") for r in results)
+    if failures:
+        raise click.ClickException(
+            f"{failures} operation{'' if failures == 1 else 's'} not applied"
+        )
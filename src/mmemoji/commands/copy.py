@@ -0,0 +1,181 @@
+import fnmatch
+import io
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+import click
+from httpx import HTTPError
+
+from mmemoji import Emoji
+from mmemoji.decorators import (
+    EmojiContext,
+    compose,
+    config_option,
+    credential_options,
+    metrics_option,
+    output_option,
+    pass_context,
+    profile_options,
+    resolve_profile,
+    shard_option,
+)
+from mmemoji.plan import existing_emojis
+from mmemoji.pool import imap_bounded
+from mmemoji.profiling import profile
+from mmemoji.progress import Progress
+from mmemoji.sharding import Shard, in_shard
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+server_options = compose(
+    click.option(
+        "--from",
+        "source",
+        metavar="SERVER",
+        required=True,
+        help="server to copy emojis from,"
+        " a name from the configuration file or a URL",
+    ),
+    click.option(
+        "--to",
+        "target",
+        metavar="SERVER",
+        required=True,
+        help="server to copy emojis to,"
+        " a name from the configuration file or a URL",
+    ),
+)
+
+
+@click.command(help="Copy custom Emojis from a server to another")
+@server_options
+@click.option(
+    "-M",
+    "--match",
+    "patterns",
+    metavar="PATTERN",
+    multiple=True,
+    help="only copy emojis with a name matching the shell-style PATTERN"
+    " (can be repeated)",
+)
+@click.option(
+    "-f",
+    "--force",
+    is_flag=True,
+    help="if the emoji exists on the target server, remove it and proceed",
+)
+@click.option(
+    "-n",
+    "--no-clobber",
+    is_flag=True,
+    help="skip emojis which exist on the target server (overrides -f)",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="number of concurrent downloads, and of concurrent uploads",
+)
+@shard_option
+@config_option
+@credential_options
+@output_option
+@metrics_option
+@profile_options
+@pass_context
+def cli(
+    ctx: EmojiContext,
+    source: str,
+    target: str,
+    patterns: tuple[str, ...],
+    force: bool,
+    no_clobber: bool,
+    workers: int,
+    shard: Shard | None,
+    config: str,
+    output: str,
+    metrics_file: str | None,
+    profile_file: str | None,
+    profile_format: str,
+    profile_memory: bool,
+    **credentials: Any,  # noqa: ANN401
+) -> None:
+    ctx.output = output
+    # Both servers get their own session, so that the one of the context
+    # is left untouched, e.g. when served by `mmemoji serve`
+    source_ctx = EmojiContext()
+    target_ctx = EmojiContext()
+    emojis = []
+
+    def download(metadata: dict[str, Any]) -> bytes:
+        emoji = Emoji(source_ctx.mattermost, metadata["name"], metadata)
+        return emoji.download()
+
+    def wanted(metadata: dict[str, Any]) -> bool:
+        name = metadata["name"]
+        if not in_shard(name, shard):
+            return False
+        if no_clobber and existing.get(name):
+            # Spare the download of an image which would not be uploaded
+            return False
+        return not patterns or any(
+            fnmatch.fnmatchcase(name, pattern) for pattern in patterns
+        )
+
+    def upload(
+        item: tuple[dict[str, Any], "Future[bytes]"],
+    ) -> dict[str, Any] | None:
+        metadata, downloaded = item
+        name = metadata["name"]
+        emoji = Emoji(target_ctx.mattermost, name, existing.get(name, {}))
+        image = downloaded.result()
+        created = emoji.create(io.BytesIO(image), force, no_clobber)
+        progress.advance(1, len(image))
+        return emoji.metadata if created else None
+
+    if (
+        "://" in source
+        and "://" in target
+        and urlparse(source).netloc != urlparse(target).netloc
+    ):
+        # The same credentials would be sent to both servers
+        raise click.UsageError(
+            "--from and --to are URLs of different servers,"
+            " describe one of them in the configuration file"
+        )
+    source_profile = resolve_profile(config, source, **credentials)
+    target_profile = resolve_profile(config, target, **credentials)
+    with (
+        profile(profile_file, profile_format, profile_memory),
+        ctx.collect_metrics(metrics_file, "copy"),
+    ):
+        # Requests to both servers are accounted for
+        source_ctx.metrics = target_ctx.metrics = ctx.metrics
+        with (
+            source_ctx.authenticate(**source_profile),
+            target_ctx.authenticate(**target_profile),
+            Progress(None, "copy") as progress,
+        ):
+            try:
+                existing = existing_emojis(target_ctx.mattermost)
+                # Images flow from the download pool to the upload pool,
+                # each holding a bounded number of them in memory
+                downloads = imap_bounded(
+                    download,
+                    filter(wanted, Emoji.iterate(source_ctx.mattermost)),
+                    workers,
+                )
+                for _, future in imap_bounded(upload, downloads, workers):
+                    created = future.result()
+                    if created is not None:
+                        emojis.append(created)
+                        ctx.count_items("succeeded")
+            except HTTPError as e:
+                raise click.ClickException(
+                    e.args[0] if e.args != () else repr(e)
+                ) from e
+            finally:
+                ctx.print_dict(emojis)
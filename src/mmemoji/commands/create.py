@@ -1,14 +1,175 @@
-from typing import BinaryIO
+import fnmatch
+import json
+import os
+from collections.abc import Iterable, Iterator
 
 import click
 from httpx import HTTPError
 
-from mmemoji import Emoji
-from mmemoji.decorators import EmojiContext, parse_global_options
+from mmemoji import Emoji, EmojiClient
+from mmemoji.decorators import (
+    EmojiContext,
+    dry_run_options,
+    journal_option,
+    keep_going_options,
+    parse_global_options,
+    shard_option,
+)
+from mmemoji.failures import read_failures
+from mmemoji.plan import plan_create
+from mmemoji.progress import Progress
+from mmemoji.sharding import Shard, in_shard
+
+
+def find_images(
+    paths: Iterable[str],
+    recursive: bool = False,
+    include: tuple[str, ...] = (),
+    exclude: tuple[str, ...] = (),
+) -> Iterator[str]:
+    """Find images lazily, walking directories with os.scandir
+
+    Files given explicitly are always yielded, files found in directories
+    are filtered by name with the include and exclude patterns,
+    hidden files and directories, and links to directories, are skipped.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            yield from _scan(path, recursive, include, exclude)
+        else:
+            yield path
+
+
+def _scan(
+    directory: str,
+    recursive: bool,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+) -> Iterator[str]:
+    subdirectories = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            # Symbolic links to directories are not walked, like os.walk(),
+            # a link to a parent directory would loop forever
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    # Walked once this directory is closed
+                    subdirectories.append(entry.path)
+            elif (
+                entry.is_file()
+                and (
+                    not include
+                    or any(fnmatch.fnmatch(entry.name, p) for p in include)
+                )
+                and not any(fnmatch.fnmatch(entry.name, p) for p in exclude)
+            ):
+                yield entry.path
+    for subdirectory in subdirectories:
+        yield from _scan(subdirectory, recursive, include, exclude)
+
+
+def read_answers(path: str | None) -> dict[str, bool]:
+    """Read overwrite answers given in a previous run"""
+    if path is None or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            answers = json.load(f)
+    except ValueError as e:
+        raise click.ClickException(f"{path}: Invalid answers") from e
+    if not isinstance(answers, dict):
+        raise click.ClickException(f"{path}: Invalid answers")
+    return {str(name): bool(answer) for name, answer in answers.items()}
+
+
+def resolve_conflicts(
+    ctx: EmojiContext, images: list[str], answers_path: str | None
+) -> dict[str, bool]:
+    """Ask upfront whether to overwrite each conflicting emoji
 
+    Conflicts are emojis which already exist or which are created
+    more than once, they are all found in one batched pass,
+    then prompted for, unless they were answered in the answers file.
+    """
+    names = [Emoji.sanitize_name(image) for image in images]
+    existing = EmojiClient(ctx.mattermost).resolve(names)
+    answers = read_answers(answers_path)
 
-@click.command(help="Create custom Emojis")
-@click.argument("images", type=click.File("rb", lazy=True), nargs=-1)
+    conflicts: dict[str, bool] = {}
+    seen = set()
+    for name in names:
+        if (existing[name] or name in seen) and name not in conflicts:
+            if name not in answers:
+                answers[name] = click.confirm(f'overwrite "{name}"?', err=True)
+            conflicts[name] = answers[name]
+        seen.add(name)
+
+    if answers_path:
+        with open(answers_path, "w") as f:
+            json.dump(answers, f, indent=2)
+    return conflicts
+
+
+def reject_stdin(
+    ctx: click.Context, param: click.Parameter, value: tuple[str, ...]
+) -> tuple[str, ...]:
+    """Images are read from paths, which their Emoji names come from"""
+    if "-" in value:
+        raise click.BadParameter(
+            "images cannot be read from the standard input,"
+            " emoji names are taken from file names"
+        )
+    return value
+
+
+def print_plan(
+    ctx: EmojiContext,
+    images: Iterable[str],
+    force: bool,
+    no_clobber: bool,
+    save_plan: str | None,
+) -> None:
+    """Print the operations planned to create emojis, see --dry-run"""
+    try:
+        operations = plan_create(
+            ctx.mattermost, list(images), force, no_clobber
+        )
+    except HTTPError as e:
+        raise click.ClickException(
+            e.args[0] if e.args != () else repr(e)
+        ) from e
+    ctx.print_plan("create", operations, save_plan)
+
+
+@click.command(help="Create custom Emojis from images and directories")
+@click.argument(
+    "images",
+    type=click.Path(exists=True, allow_dash=True),
+    nargs=-1,
+    callback=reject_stdin,
+)
+@click.option(
+    "-r",
+    "--recursive",
+    is_flag=True,
+    help="create emojis from images in subdirectories too",
+)
+@click.option(
+    "--include",
+    metavar="PATTERN",
+    multiple=True,
+    help="only create emojis from files in directories with a name"
+    " matching the shell-style PATTERN (can be repeated)",
+)
+@click.option(
+    "--exclude",
+    metavar="PATTERN",
+    multiple=True,
+    help="skip files in directories with a name"
+    " matching the shell-style PATTERN (can be repeated)",
+)
 @click.option(
     "-f",
     "--force",
@@ -27,34 +188,91 @@ if the emoji exists, remove it and proceed \
 @click.option(
     "-i", "--interactive", is_flag=True, help="prompt before overwrite"
 )
+@click.option(
+    "--answers",
+    metavar="FILE",
+    type=click.Path(dir_okay=False),
+    help="with -i, read overwrite answers from FILE"
+    " and store the ones prompted for",
+)
+@shard_option
+@journal_option
+@keep_going_options
+@dry_run_options
 @parse_global_options
 def cli(
     ctx: EmojiContext,
-    images: list[BinaryIO],
+    images: list[str],
+    recursive: bool,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
     force: bool,
     no_clobber: bool,
     interactive: bool,
+    answers: str | None,
+    shard: Shard | None,
+    journal: str | None,
+    keep_going: bool,
+    failures_path: str | None,
+    retry: str | None,
+    dry_run: bool,
+    save_plan: str | None,
 ) -> None:
+    images = [*images, *read_failures(retry, ctx.item_scope("create"))]
+    found: Iterable[str] = (
+        image
+        for image in find_images(images, recursive, include, exclude)
+        if in_shard(image, shard)
+    )
+    if dry_run or save_plan:
+        print_plan(ctx, found, force, no_clobber, save_plan)
+        return
+
     emojis = []
 
     try:
-        with click.progressbar(images, show_pos=True) as pb_images:
-            for image in pb_images:
-                emoji = Emoji(ctx.mattermost, image.name)
-
-                if emoji.metadata and not no_clobber and interactive:
-                    force = click.confirm(
-                        f'overwrite "{emoji.name}"?', err=True
-                    )
-                    if not force:
-                        continue
-
-                with image as img:
-                    if emoji.create(img, force, no_clobber):
-                        emojis.append(emoji.metadata)
+        with (
+            ctx.journal(journal, "create") as finished,
+            ctx.failures(failures_path, "create", keep_going) as failures,
+        ):
+            pending: Iterable[str] = (
+                image
+                for image in found
+                if os.path.abspath(image) not in finished
+            )
+            if not any(os.path.isdir(image) for image in images):
+                # Images are already in memory, count them for the ETA
+                pending = list(pending)
+            conflicts = {}
+            if interactive and not no_clobber:
+                pending = list(pending)
+                conflicts = resolve_conflicts(ctx, pending, answers)
+
+            total = len(pending) if isinstance(pending, list) else None
+            with Progress(total, ctx.item_scope("create")) as progress:
+                for image in progress.track(pending):
+                    with failures.catch(image):
+                        path = os.path.abspath(image)
+                        emoji = Emoji(ctx.mattermost, image)
+
+                        overwrite = force
+                        if emoji.name in conflicts and emoji.metadata:
+                            overwrite = conflicts[emoji.name]
+                            if not overwrite:
+                                finished.add(path)
+                                continue
+
+                        with open(image, "rb") as img:
+                            if emoji.create(img, overwrite, no_clobber):
+                                emojis.append(emoji.metadata)
+                                ctx.count_items("succeeded")
+                                progress.advance(0, img.tell())
+                        finished.add(path)
     except HTTPError as e:
         raise click.ClickException(
             e.args[0] if e.args != () else repr(e)
         ) from e
+    except OSError as e:
+        raise click.ClickException(str(e)) from e
     finally:
         ctx.print_dict(emojis)
@@ -0,0 +1,177 @@
+import hashlib
+import importlib
+import importlib.util
+import io
+from typing import Any
+
+import click
+from httpx import HTTPError
+
+from mmemoji import Emoji
+from mmemoji.decorators import EmojiContext, parse_global_options
+from mmemoji.pool import imap_bounded
+
+
+def perceptual_hash(image: bytes) -> int:
+    """Compute the 64-bit difference hash (dHash) of an image
+
+    Similar images have hashes with a small Hamming distance.
+    Requires Pillow, which is an optional dependency.
+    """
+    pil_image = importlib.import_module("PIL.Image")
+    with pil_image.open(io.BytesIO(image)) as img:
+        pixels = list(img.convert("L").resize((9, 8)).getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = bits << 1 | (left > right)
+    return bits
+
+
+class DuplicateIndex:
+    """Group Emojis by image hash, keeping only hashes and metadata
+
+    Perceptual hashes within ``distance`` of each other are equal on at
+    least one of ``distance + 1`` bands of their bits, hashes are bucketed
+    by band so that only the groups sharing a band get compared.
+    """
+
+    def __init__(self, distance: int = 0) -> None:
+        self.distance = distance
+        self._groups: dict[int | str, list[dict[str, Any]]] = {}
+        bands = distance + 1
+        self._bands = [
+            (64 * i // bands, 64 * (i + 1) // bands) for i in range(bands)
+        ]
+        self._buckets: dict[tuple[int, int], list[int]] = {}
+        self._ranks: dict[int, int] = {}
+
+    def _band_keys(self, key: int) -> list[tuple[int, int]]:
+        return [
+            (i, key >> start & ((1 << (end - start)) - 1))
+            for i, (start, end) in enumerate(self._bands)
+        ]
+
+    def add(self, key: int | str, metadata: dict[str, Any]) -> None:
+        if self.distance and isinstance(key, int):
+            band_keys = self._band_keys(key)
+            close = [
+                group_key
+                for band_key in band_keys
+                for group_key in self._buckets.get(band_key, [])
+                if (group_key ^ key).bit_count() <= self.distance
+            ]
+            if close:
+                # Attach to the first group with a close enough hash
+                key = min(close, key=self._ranks.__getitem__)
+            else:
+                self._ranks[key] = len(self._ranks)
+                for band_key in band_keys:
+                    self._buckets.setdefault(band_key, []).append(key)
+        self._groups.setdefault(key, []).append(
+            {
+                k: metadata.get(k)
+                for k in ("id", "name", "creator_id", "create_at")
+            }
+        )
+
+    def duplicates(self) -> list[list[dict[str, Any]]]:
+        """Groups of more than one Emoji, oldest Emoji first"""
+        return [
+            sorted(group, key=lambda m: m["create_at"] or 0)
+            for group in self._groups.values()
+            if len(group) > 1
+        ]
+
+
+def index_emojis(
+    ctx: EmojiContext, perceptual: bool, distance: int, workers: int
+) -> DuplicateIndex:
+    """Download the images of all Emojis and index their hashes"""
+    index = DuplicateIndex(distance if perceptual else 0)
+
+    def fingerprint(metadata: dict[str, Any]) -> int | str:
+        image = Emoji(ctx.mattermost, metadata["name"], metadata).download()
+        if perceptual:
+            return perceptual_hash(image)
+        return hashlib.sha256(image).hexdigest()
+
+    emojis = Emoji.iterate(ctx.mattermost)
+    for metadata, future in imap_bounded(fingerprint, emojis, workers):
+        index.add(future.result(), metadata)
+    return index
+
+
+@click.command(help="Find custom Emojis with duplicate images")
+@click.option(
+    "-p",
+    "--perceptual",
+    is_flag=True,
+    help="compare images with a perceptual hash instead of their content"
+    " (requires Pillow)",
+)
+@click.option(
+    "-d",
+    "--distance",
+    type=click.IntRange(min=0, max=64),
+    default=4,
+    show_default=True,
+    help="maximum Hamming distance between perceptual hashes",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="number of images to download concurrently",
+)
+@click.option(
+    "--delete",
+    is_flag=True,
+    help="delete all duplicates except the oldest emoji of each group",
+)
+@click.option(
+    "-i", "--interactive", is_flag=True, help="prompt before every removal"
+)
+@parse_global_options
+def cli(
+    ctx: EmojiContext,
+    perceptual: bool,
+    distance: int,
+    workers: int,
+    delete: bool,
+    interactive: bool,
+) -> None:
+    if perceptual and importlib.util.find_spec("PIL") is None:
+        raise click.ClickException(
+            "--perceptual requires Pillow, install mmemoji[perceptual]"
+        )
+
+    rows = []
+    try:
+        index = index_emojis(ctx, perceptual, distance, workers)
+        for group, duplicates in enumerate(index.duplicates(), start=1):
+            for i, metadata in enumerate(duplicates):
+                row = {"group": group, **metadata, "deleted": False}
+                rows.append(row)
+                if not delete or i == 0:
+                    continue
+                emoji = Emoji(ctx.mattermost, metadata["name"], metadata)
+                if interactive and not click.confirm(
+                    f'delete "{emoji.name}"'
+                    f' (duplicate of "{duplicates[0]["name"]}")?',
+                    err=True,
+                ):
+                    continue
+                row["deleted"] = emoji.delete(force=True)
+    except HTTPError as e:
+        raise click.ClickException(
+            e.args[0] if e.args != () else repr(e)
+        ) from e
+    except OSError as e:
+        raise click.ClickException(f"Unable to read image: {e}") from e
+    finally:
+        ctx.print_dict(rows)
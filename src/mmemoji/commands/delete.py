@@ -1,38 +1,116 @@
+import itertools
+from typing import IO
+
 import click
 from httpx import HTTPError
 
 from mmemoji import Emoji
-from mmemoji.decorators import EmojiContext, parse_global_options
+from mmemoji.completion import complete_emoji_names
+from mmemoji.decorators import (
+    EmojiContext,
+    dry_run_options,
+    from_file_option,
+    iter_names,
+    journal_option,
+    keep_going_options,
+    parse_global_options,
+    shard_option,
+)
+from mmemoji.failures import read_failures
+from mmemoji.plan import plan_delete
+from mmemoji.progress import Progress
+from mmemoji.sharding import Shard, in_shard
 
 
-@click.command(help="Delete custom Emojis")
-@click.argument("emoji_names", nargs=-1)
+@click.command(
+    help="Delete custom Emojis, a `-` name reads names from the standard input"
+)
+@click.argument("emoji_names", nargs=-1, shell_complete=complete_emoji_names)
+@from_file_option
 @click.option("-f", "--force", is_flag=True, help="ignore nonexistent files")
 @click.option(
     "-i", "--interactive", is_flag=True, help="prompt before every removal"
 )
+@shard_option
+@journal_option
+@keep_going_options
+@dry_run_options
 @parse_global_options
 def cli(
-    ctx: EmojiContext, emoji_names: list[str], force: bool, interactive: bool
+    ctx: EmojiContext,
+    emoji_names: list[str],
+    from_file: IO[str] | None,
+    force: bool,
+    interactive: bool,
+    shard: Shard | None,
+    journal: str | None,
+    keep_going: bool,
+    failures_path: str | None,
+    retry: str | None,
+    dry_run: bool,
+    save_plan: str | None,
 ) -> None:
-    emojis = []
+    streamed = from_file is not None or "-" in emoji_names
+    if streamed and interactive:
+        raise click.UsageError(
+            "--interactive cannot be used when reading names from a file"
+        )
+    if streamed and ctx.server is not None:
+        raise click.UsageError(
+            "names cannot be read from a file with --servers"
+        )
+    failed = read_failures(retry, ctx.item_scope("delete"))
+    names = (
+        (name, metadata)
+        for name, metadata in itertools.chain(
+            iter_names(emoji_names, from_file),
+            ((name, None) for name in failed),
+        )
+        if in_shard(name, shard)
+    )
+
+    if dry_run or save_plan:
+        try:
+            operations = plan_delete(
+                ctx.mattermost, [name for name, _ in names], force
+            )
+        except HTTPError as e:
+            raise click.ClickException(
+                e.args[0] if e.args != () else repr(e)
+            ) from e
+        ctx.print_plan("delete", operations, save_plan)
+        return
+
+    total = None if streamed or shard else len(emoji_names) + len(failed)
     try:
-        with click.progressbar(emoji_names, show_pos=True) as pb_names:
-            for name in pb_names:
-                emoji = Emoji(ctx.mattermost, name)
-
-                if (
-                    interactive
-                    and emoji.metadata
-                    and not click.confirm(f'delete "{emoji.name}"?', err=True)
-                ):
-                    continue
-
-                if emoji.delete(force):
-                    emojis.append(emoji.metadata)
+        with (
+            ctx.stream_dict() as add_row,
+            ctx.journal(journal, "delete") as finished,
+            ctx.failures(failures_path, "delete", keep_going) as failures,
+            Progress(total, ctx.item_scope("delete")) as progress,
+        ):
+            for name, metadata in progress.track(names):
+                with failures.catch(name):
+                    # Known metadata spares a lookup of the emoji
+                    emoji = Emoji(ctx.mattermost, name, metadata)
+                    if emoji.name in finished:
+                        continue
+
+                    if (
+                        interactive
+                        and emoji.metadata
+                        and not click.confirm(
+                            f'delete "{emoji.name}"?', err=True
+                        )
+                    ):
+                        finished.add(emoji.name)
+                        continue
+
+                    if emoji.delete(force):
+                        add_row(emoji.metadata)
+                        ctx.count_items("succeeded")
+                    finished.add(emoji.name)
     except HTTPError as e:
         raise click.ClickException(
             e.args[0] if e.args != () else repr(e)
         ) from e
-    finally:
-        ctx.print_dict(emojis)
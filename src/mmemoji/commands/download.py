@@ -1,11 +1,26 @@
+import itertools
 import os
+from typing import IO
 
 import click
 from filetype import filetype
 from httpx import HTTPError
 
 from mmemoji import Emoji
-from mmemoji.decorators import EmojiContext, parse_global_options
+from mmemoji.completion import complete_emoji_names
+from mmemoji.decorators import (
+    EmojiContext,
+    from_file_option,
+    iter_names,
+    journal_option,
+    keep_going_options,
+    parse_global_options,
+    shard_option,
+)
+from mmemoji.failures import read_failures
+from mmemoji.mirror import mirror
+from mmemoji.progress import Progress
+from mmemoji.sharding import Shard, in_shard
 
 
 def check_destination(
@@ -18,11 +33,13 @@ def check_destination(
     but if the destination is explicitly a directory,
     the full path must exits.
 
-    For more than 1 emoji, the destination has to be an existing directory.
+    For more than 1 emoji, or names read from a file,
+    the destination has to be an existing directory.
 
     Finally, the destination has to be writable.
     """
-    count = len(ctx.params["emoji_names"])
+    names = ctx.params["emoji_names"]
+    count = 2 if "-" in names or ctx.params.get("from_file") else len(names)
     if count == 1 and value[-1] != os.path.sep and not os.path.isdir(value):
         directory = os.path.dirname(value) or os.getcwd()
     else:
@@ -36,8 +53,35 @@ def check_destination(
     return value
 
 
-@click.command(help="Download custom Emojis")
-@click.argument("emoji_names", nargs=-1)
+def image_filename(destination: str, name: str, image: bytes) -> str:
+    """Path of an image downloaded to a file or into a directory"""
+    if not os.path.isdir(destination):
+        return destination
+    return os.path.join(
+        destination, f"{name}.{filetype.guess_extension(image)}"
+    )
+
+
+def mirror_destination(
+    ctx: EmojiContext, destination: str, shard: Shard | None
+) -> None:
+    """Sync a directory with all the emojis of the server, see --mirror"""
+    try:
+        changes = mirror(ctx.mattermost, destination, shard=shard)
+    except HTTPError as e:
+        raise click.ClickException(
+            e.args[0] if e.args != () else repr(e)
+        ) from e
+    ctx.count_items("succeeded", len(changes))
+    ctx.print_dict(changes)
+
+
+@click.command(
+    help="Download custom Emojis,"
+    " a `-` name reads names from the standard input"
+)
+@click.argument("emoji_names", nargs=-1, shell_complete=complete_emoji_names)
+@from_file_option
 @click.argument("destination", callback=check_destination, type=click.Path())
 @click.option(
     "-f",
@@ -54,40 +98,93 @@ def check_destination(
 @click.option(
     "-i", "--interactive", is_flag=True, help="prompt before overwrite"
 )
+@click.option(
+    "--mirror",
+    "mirror_",
+    is_flag=True,
+    help="keep the DESTINATION directory in sync with all the emojis"
+    " of the server, only new or changed emojis are downloaded,"
+    " and files of deleted emojis are removed",
+)
+@shard_option
+@journal_option
+@keep_going_options
 @parse_global_options
 def cli(
     ctx: EmojiContext,
     emoji_names: list[str],
+    from_file: IO[str] | None,
     destination: str,
     force: bool,
     no_clobber: bool,
     interactive: bool,
+    mirror_: bool,
+    shard: Shard | None,
+    journal: str | None,
+    keep_going: bool,
+    failures_path: str | None,
+    retry: str | None,
 ) -> None:
+    streamed = from_file is not None or "-" in emoji_names
+    if streamed and interactive:
+        raise click.UsageError(
+            "--interactive cannot be used when reading names from a file"
+        )
+    if streamed and ctx.server is not None:
+        raise click.UsageError(
+            "names cannot be read from a file with --servers"
+        )
+    if streamed and not os.path.isdir(destination):
+        raise click.ClickException(f"{destination}: Not a directory")
+    failed = read_failures(retry, ctx.item_scope("download"))
+    if mirror_:
+        if emoji_names or from_file or failed:
+            raise click.UsageError("EMOJI_NAMES cannot be used with --mirror")
+        mirror_destination(ctx, destination, shard)
+        return
+
+    names = (
+        (name, metadata)
+        for name, metadata in itertools.chain(
+            iter_names(emoji_names, from_file),
+            ((name, None) for name in failed),
+        )
+        if in_shard(name, shard)
+    )
+    total = None if streamed or shard else len(emoji_names) + len(failed)
     try:
-        for name in emoji_names:
-            emoji = Emoji(ctx.mattermost, name)
-            image = emoji.download()
-
-            if not os.path.isdir(destination):
-                filename = destination
-            else:
-                filename = os.path.join(
-                    destination,
-                    f"{name}.{filetype.guess_extension(image)}",
-                )
-
-            if os.path.exists(filename) and (
-                (not interactive and (no_clobber or not force))
-                or (
-                    interactive
-                    and not click.confirm(f'overwrite "{filename}"?', err=True)
-                )
-            ):
-                continue
-
-            with open(filename, "wb") as f:
-                f.write(image)
-            click.echo(filename)
+        with (
+            ctx.journal(journal, "download") as finished,
+            ctx.failures(failures_path, "download", keep_going) as failures,
+            Progress(total, ctx.item_scope("download")) as progress,
+        ):
+            for name, metadata in progress.track(names):
+                if name in finished:
+                    continue
+                with failures.catch(name):
+                    # Known metadata spares a lookup of the emoji
+                    emoji = Emoji(ctx.mattermost, name, metadata)
+                    image = emoji.download()
+                    progress.advance(0, len(image))
+
+                    filename = image_filename(destination, name, image)
+                    if os.path.exists(filename) and (
+                        (not interactive and (no_clobber or not force))
+                        or (
+                            interactive
+                            and not click.confirm(
+                                f'overwrite "{filename}"?', err=True
+                            )
+                        )
+                    ):
+                        finished.add(name)
+                        continue
+
+                    with open(filename, "wb") as f:
+                        f.write(image)
+                    ctx.count_items("succeeded")
+                    click.echo(filename)
+                    finished.add(name)
     except HTTPError as e:
         raise click.ClickException(
             e.args[0] if e.args != () else repr(e)
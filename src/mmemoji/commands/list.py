@@ -1,16 +1,109 @@
+import os
+import re
+import time
+from contextlib import suppress
+from datetime import datetime, timezone
+
 import click
 from httpx import HTTPError
 
-from mmemoji import Emoji
-from mmemoji.decorators import EmojiContext, parse_global_options
+from mmemoji import Emoji, completion
+from mmemoji.decorators import (
+    EmojiContext,
+    parse_global_options,
+    resolve_users_option,
+)
+from mmemoji.users import resolve_creators
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_since(
+    ctx: EmojiContext, param: click.Parameter, value: str | None
+) -> int:
+    """Convert a timestamp or a duration into milliseconds since the epoch.
+
+    Accepted formats are milliseconds since the epoch (e.g. ``1700000000000``),
+    ISO 8601 dates (e.g. ``2024-01-31T12:00:00``, UTC if no offset is given)
+    and durations relative to now (e.g. ``30m``, ``12h``, ``7d``).
+    """
+    if not value:
+        return 0
+    if value.isdigit():
+        return int(value)
+    match = re.fullmatch(r"(\d+)([smhdw])", value)
+    if match:
+        seconds = int(match.group(1)) * DURATION_UNITS[match.group(2)]
+        return int((time.time() - seconds) * 1000)
+    try:
+        date = datetime.fromisoformat(value)
+    except ValueError as e:
+        raise click.BadParameter(
+            f"Not a timestamp or a duration: {value}"
+        ) from e
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return int(date.timestamp() * 1000)
+
+
+def read_state(path: str) -> int:
+    """Read the high-water mark stored by a previous run"""
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        content = f.read().strip()
+    if not content.isdigit():
+        raise click.ClickException(f"{path}: Invalid high-water mark")
+    return int(content)
+
+
+def write_state(path: str, mark: int) -> None:
+    """Atomically store the high-water mark for the next run"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(f"{mark}\n")
+    os.replace(tmp_path, path)
 
 
 @click.command(help="List custom Emojis")
+@click.option(
+    "-s",
+    "--since",
+    metavar="TIMESTAMP|DURATION",
+    callback=parse_since,
+    help="only list emojis created or updated after a timestamp"
+    " (milliseconds since the epoch or ISO 8601 date)"
+    " or a duration (e.g. 30m, 12h, 7d)",
+)
+@click.option(
+    "--state",
+    metavar="FILE",
+    type=click.Path(dir_okay=False),
+    help="read the high-water mark from FILE when --since is not specified,"
+    " and store the latest modification timestamp listed for the next run",
+)
+@resolve_users_option
 @parse_global_options
-def cli(ctx: EmojiContext) -> None:
+def cli(
+    ctx: EmojiContext, since: int, state: str | None, resolve_users: bool
+) -> None:
+    if state and not since:
+        since = read_state(state)
     try:
-        ctx.print_dict(Emoji.list(ctx.mattermost))
+        emojis = Emoji.list(ctx.mattermost, since=since)
+        if resolve_users:
+            emojis = resolve_creators(ctx.mattermost, emojis)
     except HTTPError as e:
         raise click.ClickException(
             e.args[0] if e.args != () else repr(e)
         ) from e
+    ctx.print_dict(emojis)
+    if not since:
+        with suppress(OSError):
+            completion.write_names(
+                ctx.url.geturl(), [emoji["name"] for emoji in emojis]
+            )
+    if state:
+        write_state(
+            state, max((Emoji.updated_at(e) for e in emojis), default=since)
+        )
@@ -0,0 +1,156 @@
+from collections import Counter
+from typing import IO, Any
+
+import click
+from httpx import HTTPError
+
+from mmemoji import Emoji
+from mmemoji.decorators import EmojiContext, parse_global_options
+from mmemoji.pool import imap_bounded
+
+
+def read_mapping(mapping_file: IO[str]) -> list[tuple[str, str]]:
+    """Read pairs of old and new names, one pair per line"""
+    pairs = []
+    for number, line in enumerate(mapping_file, start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        names = line.replace(",", " ").split()
+        if len(names) != 2:
+            raise click.ClickException(
+                f"{mapping_file.name}:{number}: Expected OLD_NAME NEW_NAME"
+            )
+        pairs.append((names[0], names[1]))
+    return pairs
+
+
+def order_pairs(pairs: list[tuple[str, str]]) -> list[list[tuple[str, str]]]:
+    """Split pairs of old and new names into batches run one after another
+
+    A pair renaming to the old name of another pair runs in a later batch,
+    e.g. ``b c`` runs before ``a b``, the pairs of a batch run concurrently.
+    Names used twice, and cycles such as swaps, are rejected.
+    """
+    for position, names in (
+        ("old", [old for old, _ in pairs]),
+        ("new", [new for _, new in pairs]),
+    ):
+        duplicates = sorted(
+            n for n, count in Counter(names).items() if count > 1
+        )
+        if duplicates:
+            raise click.ClickException(
+                f"Duplicate {position} names: {', '.join(duplicates)}"
+            )
+
+    batches = []
+    pending = pairs
+    while pending:
+        old_names = {old for old, _ in pending}
+        batch = [pair for pair in pending if pair[1] not in old_names]
+        if not batch:
+            raise click.ClickException(
+                "Circular renames: "
+                + ", ".join(f"{old} -> {new}" for old, new in pending)
+            )
+        batches.append(batch)
+        pending = [pair for pair in pending if pair[1] in old_names]
+    return batches
+
+
+def rename_batch(
+    ctx: EmojiContext,
+    pairs: list[tuple[str, str]],
+    force: bool,
+    workers: int,
+    emojis: list[dict[str, Any]],
+    errors: dict[str, str],
+) -> None:
+    """Rename pairs of a batch concurrently
+
+    Renamed emojis are added to ``emojis``, and errors to ``errors``
+    by old name, the pairs renaming to a name which failed to be renamed
+    are skipped.
+    """
+
+    def rename(pair: tuple[str, str]) -> dict[str, Any]:
+        return Emoji(ctx.mattermost, pair[0]).rename(pair[1], force).metadata
+
+    ready = []
+    for old, new in pairs:
+        if new in errors:
+            ctx.count_items("failed")
+            errors[old] = f"{old} -> {new}: {new} was not renamed"
+        else:
+            ready.append((old, new))
+
+    for pair, future in imap_bounded(rename, ready, workers):
+        error = future.exception()
+        if error is None:
+            emojis.append(future.result())
+            ctx.count_items("succeeded")
+        elif isinstance(error, HTTPError):
+            ctx.count_items("failed")
+            message = error.args[0] if error.args != () else repr(error)
+            errors[pair[0]] = f"{pair[0]} -> {pair[1]}: {message}"
+        else:
+            raise error
+
+
+@click.command(help="Rename custom Emojis")
+@click.argument("old_name", required=False)
+@click.argument("new_name", required=False)
+@click.option(
+    "--mapping",
+    "mapping_file",
+    metavar="FILE",
+    type=click.File("r"),
+    help="rename many emojis, reading OLD_NAME NEW_NAME pairs"
+    " from FILE, one per line",
+)
+@click.option(
+    "-f",
+    "--force",
+    is_flag=True,
+    help="if an emoji with the new name exists, remove it and proceed",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="number of emojis to rename concurrently",
+)
+@parse_global_options
+def cli(
+    ctx: EmojiContext,
+    old_name: str | None,
+    new_name: str | None,
+    mapping_file: IO[str] | None,
+    force: bool,
+    workers: int,
+) -> None:
+    if mapping_file is not None:
+        if old_name is not None:
+            raise click.UsageError(
+                "OLD_NAME NEW_NAME cannot be used with --mapping"
+            )
+        pairs = read_mapping(mapping_file)
+    elif old_name is None or new_name is None:
+        raise click.UsageError("Missing OLD_NAME NEW_NAME or --mapping")
+    else:
+        pairs = [(old_name, new_name)]
+
+    batches = order_pairs(pairs)
+
+    emojis: list[dict[str, Any]] = []
+    errors: dict[str, str] = {}
+    try:
+        for batch in batches:
+            rename_batch(ctx, batch, force, workers, emojis, errors)
+    finally:
+        ctx.print_dict(emojis)
+    if errors:
+        raise click.ClickException("\n".join(errors.values()))
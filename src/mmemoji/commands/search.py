@@ -2,7 +2,12 @@ import click
 from httpx import HTTPError
 
 from mmemoji import Emoji
-from mmemoji.decorators import EmojiContext, parse_global_options
+from mmemoji.decorators import (
+    EmojiContext,
+    parse_global_options,
+    resolve_users_option,
+)
+from mmemoji.users import resolve_creators
 
 
 @click.command(help="Search custom Emojis (200 results maximum)")
@@ -13,10 +18,16 @@ from mmemoji.decorators import EmojiContext, parse_global_options
     is_flag=True,
     help="only search for names starting with the search term",
 )
+@resolve_users_option
 @parse_global_options
-def cli(ctx: EmojiContext, term: str, prefix_only: bool) -> None:
+def cli(
+    ctx: EmojiContext, term: str, prefix_only: bool, resolve_users: bool
+) -> None:
     try:
-        ctx.print_dict(Emoji.search(ctx.mattermost, term, prefix_only))
+        emojis = Emoji.search(ctx.mattermost, term, prefix_only)
+        if resolve_users:
+            emojis = resolve_creators(ctx.mattermost, emojis)
+        ctx.print_dict(emojis)
     except HTTPError as e:
         raise click.ClickException(
             e.args[0] if e.args != () else repr(e)
@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import socketserver
+import stat
+import sys
+from collections.abc import Iterable, Iterator
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any
+
+import click
+
+from mmemoji.decorators import (
+    EmojiContext,
+    live_option,
+    parse_global_options,
+)
+
+
+def run_request(ctx: EmojiContext, line: str) -> dict[str, Any]:
+    """Run a command described by a JSON request with the current session
+
+    A request is a JSON object such as
+    ``{"id": 1, "command": "delete", "args": ["emoji_1", "-o", "json"]}``,
+    the response holds the exit code and the captured outputs,
+    and the ``id`` of the request if any.
+    """
+    response: dict[str, Any] = {}
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    stdin = sys.stdin
+    # Prompts cannot be answered, they are aborted instead
+    sys.stdin = io.StringIO()
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("not an object")
+                response["id"] = request.get("id")
+                name = str(request.get("command", ""))
+                args = [str(arg) for arg in request.get("args", [])]
+            except ValueError as e:
+                click.echo(f"Error: Invalid request: {e}", err=True)
+                response["exit_code"] = 2
+            else:
+                response["exit_code"] = run_command(ctx, name, args)
+    finally:
+        sys.stdin = stdin
+    response["stdout"] = stdout.getvalue()
+    response["stderr"] = stderr.getvalue()
+    return response
+
+
+def run_command(ctx: EmojiContext, name: str, args: list[str]) -> int:
+    """Invoke a subcommand in-process and return its exit code"""
+    click_ctx = click.get_current_context()
+    root = click_ctx.find_root()
+    try:
+        if name == click_ctx.info_name:
+            raise click.UsageError(f'"{name}" cannot be nested')
+        command = root.command
+        if not isinstance(command, click.Group):
+            raise click.UsageError("No subcommands available")
+        subcommand = command.get_command(root, name)
+        if subcommand is None:
+            raise click.UsageError(f'Unknown command "{name}"')
+        rv = subcommand.main(
+            args,
+            prog_name=f"{root.info_name} {name}",
+            standalone_mode=False,
+            obj=ctx,
+        )
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except Exception as e:
+        # A failing request must not bring the long-lived server down
+        click.echo(f"Error: {str(e) or repr(e)}", err=True)
+        return 1
+    return rv if isinstance(rv, int) else 0
+
+
+def serve_lines(ctx: EmojiContext, lines: Iterable[str]) -> Iterator[str]:
+    """Answer JSON line requests until the end of the input"""
+    for line in lines:
+        if line.strip():
+            yield json.dumps(run_request(ctx, line))
+
+
+def serve_socket(ctx: EmojiContext, path: str) -> None:
+    """Answer JSON line requests from clients of a Unix socket
+
+    Clients are served one at a time since commands write to the
+    process-wide standard outputs.
+    """
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            lines = (raw.decode("utf-8") for raw in self.rfile)
+            for response in serve_lines(ctx, lines):
+                self.wfile.write(f"{response}\n".encode())
+                self.wfile.flush()
+
+    if os.path.exists(path):
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise click.ClickException(f"{path}: Not a socket")
+        os.unlink(path)
+
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
+@click.command(
+    help="Serve commands as JSON lines with a single authenticated session"
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    metavar="PATH",
+    type=click.Path(dir_okay=False),
+    help="listen on a Unix socket instead of the standard input",
+)
+@live_option
+@parse_global_options
+def cli(ctx: EmojiContext, socket_path: str | None, live: bool) -> None:
+    if ctx.server is not None:
+        raise click.UsageError("serve cannot be used with --servers")
+
+    with ctx.listen(live):
+        if socket_path:
+            serve_socket(ctx, socket_path)
+        else:
+            for response in serve_lines(ctx, sys.stdin):
+                click.echo(response)
@@ -0,0 +1,164 @@
+import heapq
+import json
+from collections import Counter
+from typing import Any
+
+import click
+from httpx import HTTPError
+from tabulate import tabulate
+
+from mmemoji import Emoji
+from mmemoji.decorators import (
+    EmojiContext,
+    parse_global_options,
+    resolve_users_option,
+)
+from mmemoji.pool import imap_bounded
+from mmemoji.users import get_usernames
+
+
+class Stats:
+    """Running totals over a stream of Emojis"""
+
+    def __init__(self, top: int) -> None:
+        self.top = top
+        self.count = 0
+        self.size = 0
+        self.creators: Counter[str] = Counter()
+        self.formats: Counter[str] = Counter()
+        self.format_sizes: Counter[str] = Counter()
+        self._largest: list[tuple[int, str]] = []
+
+    def add(
+        self, metadata: dict[str, Any], size: int = 0, extension: str = ""
+    ) -> None:
+        """Account for an Emoji, its image size and format"""
+        self.count += 1
+        self.creators[metadata.get("creator_id", "")] += 1
+        if not extension:
+            return
+        self.size += size
+        self.formats[extension] += 1
+        self.format_sizes[extension] += size
+        # Min-heap of the largest images seen so far
+        entry = (size, metadata["name"])
+        if len(self._largest) < self.top:
+            heapq.heappush(self._largest, entry)
+        elif entry > self._largest[0]:
+            heapq.heapreplace(self._largest, entry)
+
+    @property
+    def largest(self) -> list[tuple[int, str]]:
+        """Largest images, in descending order of size"""
+        return sorted(self._largest, reverse=True)
+
+    def to_dict(self, usernames: dict[str, str]) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "size": self.size,
+            "creators": [
+                {
+                    "creator_id": creator_id,
+                    **(
+                        {"creator_username": usernames.get(creator_id, "")}
+                        if usernames
+                        else {}
+                    ),
+                    "count": count,
+                }
+                for creator_id, count in self.creators.most_common()
+            ],
+            "formats": [
+                {
+                    "format": extension,
+                    "count": count,
+                    "size": self.format_sizes[extension],
+                }
+                for extension, count in self.formats.most_common()
+            ],
+            "largest": [
+                {"name": name, "size": size} for size, name in self.largest
+            ],
+        }
+
+
+def print_stats(output: str, result: dict[str, Any]) -> None:
+    """Print the statistics in the output format"""
+    if output == "json":
+        click.echo(json.dumps(result, indent=2))
+        return
+    if output == "ndjson":
+        click.echo(json.dumps(result))
+        return
+
+    click.echo(
+        tabulate(
+            [["emojis", result["count"]], ["size", result["size"]]],
+            tablefmt="plain",
+        )
+    )
+    for section in ("creators", "formats", "largest"):
+        if result[section]:
+            click.echo()
+            click.echo(tabulate(result[section], headers="keys"))
+
+
+@click.command(help="Compute statistics over all custom Emojis")
+@click.option(
+    "--top",
+    type=click.IntRange(min=0),
+    default=10,
+    show_default=True,
+    help="number of largest emojis to report",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="number of image sizes to request concurrently",
+)
+@click.option(
+    "--no-images",
+    is_flag=True,
+    help="only count emojis, do not request image sizes and formats",
+)
+@resolve_users_option
+@parse_global_options
+def cli(
+    ctx: EmojiContext,
+    top: int,
+    workers: int,
+    no_images: bool,
+    resolve_users: bool,
+) -> None:
+    if ctx.server is not None:
+        # The report is not a list of emojis which could be merged
+        raise click.UsageError("stats cannot be used with --servers")
+
+    stats = Stats(top)
+
+    def probe(metadata: dict[str, Any]) -> tuple[int, str | None]:
+        return Emoji(ctx.mattermost, metadata["name"], metadata).probe()
+
+    try:
+        emojis = Emoji.iterate(ctx.mattermost)
+        if no_images:
+            for metadata in emojis:
+                stats.add(metadata)
+        else:
+            for metadata, future in imap_bounded(probe, emojis, workers):
+                size, extension = future.result()
+                stats.add(metadata, size, extension or "unknown")
+        usernames = (
+            get_usernames(ctx.mattermost, stats.creators)
+            if resolve_users
+            else {}
+        )
+    except HTTPError as e:
+        raise click.ClickException(
+            e.args[0] if e.args != () else repr(e)
+        ) from e
+
+    print_stats(ctx.output, stats.to_dict(usernames))
@@ -0,0 +1,131 @@
+from typing import Any
+
+import click
+from httpx import HTTPError
+
+from mmemoji import Emoji, EmojiClient
+from mmemoji.decorators import (
+    EmojiContext,
+    live_option,
+    parse_global_options,
+)
+from mmemoji.watcher import watch
+
+
+def report(name: str, e: Exception) -> None:
+    """Report the failure of an upload, without stopping to watch"""
+    message = e.args[0] if e.args != () else repr(e)
+    click.echo(f"Error: {name}: {message}", err=True)
+
+
+def create_batch(
+    ctx: EmojiContext,
+    client: EmojiClient,
+    paths: list[str],
+    force: bool,
+    created: set[str],
+) -> list[dict[str, Any]]:
+    """Create Emojis from images, adding their names to ``created``"""
+    if not paths:
+        return []
+    try:
+        results = client.create_many(paths, force=force)
+    except HTTPError as e:
+        # Keep watching, the images are uploaded when changed again
+        report(", ".join(paths), e)
+        ctx.count_items("failed", len(paths))
+        return []
+    emojis = []
+    for result in results:
+        if "error" in result:
+            report(result["name"], result["error"])
+            ctx.count_items("failed")
+        elif result["done"]:
+            created.add(result["name"])
+            emojis.append(result["metadata"])
+            ctx.count_items("succeeded")
+    return emojis
+
+
+@click.command(
+    help="Watch a directory and create custom Emojis"
+    " from new and changed images"
+)
+@click.argument(
+    "directory", type=click.Path(exists=True, file_okay=False), nargs=1
+)
+@click.option(
+    "-f",
+    "--force",
+    is_flag=True,
+    help="if an emoji created before watching exists, remove it and proceed"
+    " (emojis created while watching are always updated)",
+)
+@click.option(
+    "--debounce",
+    metavar="SECONDS",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    help="wait for images to be left untouched for SECONDS",
+)
+@click.option(
+    "--interval",
+    metavar="SECONDS",
+    type=click.FloatRange(min=0.1),
+    default=1.0,
+    show_default=True,
+    help="delay between two scans of the directory when polling",
+)
+@click.option(
+    "--polling",
+    is_flag=True,
+    help="scan the directory periodically even if inotify is available",
+)
+@click.option(
+    "--timeout",
+    metavar="SECONDS",
+    type=click.FloatRange(min=0),
+    help="stop watching after SECONDS",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="number of images to upload concurrently",
+)
+@live_option
+@parse_global_options
+def cli(
+    ctx: EmojiContext,
+    directory: str,
+    force: bool,
+    debounce: float,
+    interval: float,
+    polling: bool,
+    timeout: float | None,
+    workers: int,
+    live: bool,
+) -> None:
+    client = EmojiClient(ctx.mattermost, max_workers=workers)
+    # Emojis created in this session, overwritten when their image changes
+    created: set[str] = set()
+
+    def upload(paths: list[str]) -> None:
+        owned = [p for p in paths if Emoji.sanitize_name(p) in created]
+        others = [p for p in paths if Emoji.sanitize_name(p) not in created]
+        emojis = [
+            *create_batch(ctx, client, owned, True, created),
+            *create_batch(ctx, client, others, force, created),
+        ]
+        if emojis:
+            ctx.print_dict(emojis)
+
+    click.echo(f"Watching {directory}...", err=True)
+    try:
+        with ctx.listen(live):
+            watch(directory, upload, debounce, interval, polling, timeout)
+    except KeyboardInterrupt:
+        pass
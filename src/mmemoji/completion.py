@@ -0,0 +1,95 @@
+"""Shell completion of Emoji names from a local cache.
+
+Emoji names are cached per server by ``mmemoji list``,
+completion only reads the cache and, when it is older than its TTL,
+refreshes it in a detached background process.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from urllib.parse import ParseResult
+
+import click
+from click.shell_completion import CompletionItem
+
+#: Age in seconds after which the cache is refreshed in the background
+CACHE_TTL = 3600
+#: Minimum delay in seconds between two background refreshes
+REFRESH_INTERVAL = 60
+
+
+def cache_path(url: str) -> str:
+    """Get the path of the Emoji names cache of a server"""
+    server = re.sub(r"[^A-Za-z0-9]+", "_", url.split("://")[-1]).strip("_")
+    return os.path.join(
+        click.get_app_dir("mmemoji"), "cache", f"names-{server}.json"
+    )
+
+
+def write_names(url: str, names: list[str]) -> None:
+    """Atomically replace the Emoji names cache of a server"""
+    path = cache_path(url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(sorted(names), f)
+    os.replace(tmp_path, path)
+
+
+def read_names(url: str) -> tuple[list[str], float]:
+    """Read the Emoji names cache of a server, and its age in seconds"""
+    path = cache_path(url)
+    try:
+        with open(path) as f:
+            names = json.load(f)
+        return names, time.time() - os.stat(path).st_mtime
+    except (OSError, ValueError):
+        return [], float("inf")
+
+
+def refresh_in_background(url: str) -> None:
+    """Refresh the Emoji names cache of a server in a detached process
+
+    Credentials are taken from the environment, as for any command.
+    """
+    marker = f"{cache_path(url)}.refresh"
+    try:
+        if time.time() - os.stat(marker).st_mtime < REFRESH_INTERVAL:
+            return
+    except OSError:
+        pass
+    try:
+        os.makedirs(os.path.dirname(marker), exist_ok=True)
+        with open(marker, "w"):
+            pass
+        subprocess.Popen(
+            [sys.executable, "-m", "mmemoji", "list", "-u", url],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def complete_emoji_names(
+    ctx: click.Context, param: click.Parameter, incomplete: str
+) -> list[CompletionItem]:
+    """Complete Emoji names without any network call on the hot path"""
+    url = ctx.params.get("url") or os.environ.get("MM_URL")
+    if isinstance(url, ParseResult):
+        url = url.geturl()
+    if not url:
+        return []
+
+    names, age = read_names(url)
+    if age > CACHE_TTL:
+        refresh_in_background(url)
+    return [
+        CompletionItem(name) for name in names if name.startswith(incomplete)
+    ]
@@ -1,9 +1,13 @@
+import configparser
 import json
+import os
 import sys
-from collections.abc import Callable, Iterator
-from contextlib import contextmanager
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from functools import wraps
 from typing import (
+    IO,
     Any,
     Protocol,
     TypedDict,
@@ -13,10 +17,19 @@ from urllib.parse import ParseResult, urlparse
 
 import click
 import httpx
+from click.core import ParameterSource
 from mattermostautodriver import TypedDriver as Mattermost
 from mattermostautodriver.exceptions import MethodNotAllowed
 from tabulate import tabulate
 
+from mmemoji import completion, plan
+from mmemoji.failures import FailureReport
+from mmemoji.journal import Journal
+from mmemoji.live import EmojiIndex, EmojiListener
+from mmemoji.metrics import Metrics
+from mmemoji.profiling import profile
+from mmemoji.sharding import Shard
+
 if sys.version_info < (3, 11):
     # Ellipsis as last parameter to Concatenate is supported from Python 3.11
     from typing_extensions import Concatenate  # noqa: UP035
@@ -42,10 +55,19 @@ class EmojiContext(click.Context):
     """
 
     output: str
+    url: ParseResult
     mattermost: Mattermost
+    authenticated: bool
+    server: str | None
+    rows: list[dict[str, Any]]
+    metrics: Metrics | None
 
     def __init__(self) -> None:
         self.output = "table"
+        self.authenticated = False
+        self.server = None
+        self.rows = []
+        self.metrics = None
 
     @contextmanager
     def authenticate(
@@ -84,12 +106,17 @@ class EmojiContext(click.Context):
         else:
             settings["port"] = 80
 
+        self.url = url
         self.mattermost = Mattermost(settings)
+        if self.metrics is not None:
+            self.metrics.instrument(self.mattermost.client.client)
         try:
             try:
                 self.mattermost.login()
+                self.authenticated = True
                 yield
             finally:
+                self.authenticated = False
                 # Logout is unnecessary if token was used
                 if not token:
                     self.mattermost.logout()
@@ -104,12 +131,168 @@ class EmojiContext(click.Context):
                 e.args[0] if e.args != () else repr(e)
             ) from e
 
-    def print_dict(self, data: list[dict[str, Any]]) -> None:
-        """Print dataset generated by a command to the standard output"""
-        count = len(data)
-        if count:
+    def fan_out(
+        self,
+        profiles: dict[str, "Profile"],
+        func: Callable[..., None],
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Run a command concurrently against multiple servers
+
+        Each server gets its own context, and so its own session,
+        the datasets are merged into a single report
+        with an additional ``server`` column.
+        """
+
+        def run(server: str, profile: Profile) -> EmojiContext:
+            child = EmojiContext()
+            child.output = self.output
+            child.server = server
+            child.metrics = self.metrics
+            with child.authenticate(**profile):
+                func(child, *args, **kwargs)
+            return child
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=len(profiles)) as executor:
+            futures = {
+                server: executor.submit(run, server, profile)
+                for server, profile in profiles.items()
+            }
+            for server, future in futures.items():
+                error = future.exception()
+                if error is None:
+                    self.rows += future.result().rows
+                elif isinstance(error, click.ClickException):
+                    errors.append(f"{server}: {error.format_message()}")
+                else:
+                    raise error
+
+        self.print_dict(self.rows)
+        if errors:
+            raise click.ClickException("\n".join(errors))
+
+    def item_scope(self, command: str) -> str:
+        """Scope of the items processed by a command on the server"""
+        return command if self.server is None else f"{command}@{self.server}"
+
+    def journal(self, path: str | None, command: str) -> Journal:
+        """Open the progress journal of a command, scoped to the server"""
+        return Journal(path, self.item_scope(command))
+
+    @contextmanager
+    def collect_metrics(
+        self, path: str | None, command: str
+    ) -> Iterator[None]:
+        """Write the metrics of a command to a Prometheus textfile"""
+        if path is None:
+            yield
+            return
+        self.metrics = Metrics(command)
+        if self.authenticated:
+            # Session is already open, e.g. by serve
+            self.metrics.instrument(self.mattermost.client.client)
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            metrics, self.metrics = self.metrics, None
+            if self.authenticated:
+                metrics.uninstrument(self.mattermost.client.client)
+            metrics.finish(success)
+            metrics.write(path)
+
+    def count_items(self, outcome: str, count: int = 1) -> None:
+        """Account for items processed by the command, see --metrics-file"""
+        if self.metrics is not None:
+            self.metrics.add_items(outcome, count)
+
+    @contextmanager
+    def listen(self, enabled: bool) -> Iterator[None]:
+        """Keep the Emojis of the server indexed from its websocket,
+        along with the names cached for the shell completion
+        """
+        if not enabled:
+            yield
+            return
+        url = self.url.geturl()
+        index = EmojiIndex()
+
+        def on_change(
+            changed: list[dict[str, Any]], removed: list[str]
+        ) -> None:
+            with suppress(OSError):
+                completion.write_names(url, index.names())
+
+        with EmojiListener(self.mattermost, index, on_change=on_change):
+            yield
+
+    @contextmanager
+    def failures(
+        self, path: str | None, command: str, keep_going: bool
+    ) -> Iterator[FailureReport]:
+        """Collect the failures of a command, reported once it is done"""
+        report = FailureReport(path, self.item_scope(command), keep_going)
+        try:
+            with report:
+                yield report
+        finally:
+            self.count_items("failed", len(report))
+        if report:
+            raise click.ClickException(report.summary())
+
+    def print_plan(
+        self, command: str, operations: list[plan.Operation], path: str | None
+    ) -> None:
+        """Print the operations planned by a command, and save them"""
+        self.print_dict([dict(operation) for operation in operations])
+        click.echo(plan.summarize(operations), err=True)
+        if path:
+            plan.save(path, command, self.url.geturl(), operations)
+
+    @contextmanager
+    def stream_dict(self) -> Iterator[Callable[[dict[str, Any]], None]]:
+        """Collect the dataset of a command row by row, printed at the end
+
+        With the ``ndjson`` output, rows are printed as soon as they are
+        added instead, so that memory stays flat on large datasets.
+        """
+        rows: list[dict[str, Any]] = []
+        streamed = 0
+
+        def add(row: dict[str, Any]) -> None:
+            nonlocal streamed
+            if self.output == "ndjson" and self.server is None:
+                click.echo(json.dumps(row))
+                streamed += 1
+            else:
+                rows.append(row)
+
+        try:
+            yield add
+        finally:
+            self.print_dict(rows, streamed)
+
+    def print_dict(
+        self, data: list[dict[str, Any]], streamed: int = 0
+    ) -> None:
+        """Print dataset generated by a command to the standard output
+
+        ``streamed`` rows were already printed, see stream_dict()
+        """
+        if self.server is not None:
+            # Collected by the parent context, see fan_out()
+            self.rows += [{"server": self.server, **row} for row in data]
+            return
+        count = len(data) + streamed
+        if data:
             if self.output == "table":
                 click.echo(tabulate(data, headers="keys"))
+            elif self.output == "ndjson":
+                for row in data:
+                    click.echo(json.dumps(row))
             else:
                 click.echo(json.dumps(data, indent=2))
 
@@ -123,15 +306,184 @@ pass_context = click.make_pass_decorator(EmojiContext, ensure=True)
 
 
 def validate_url(
-    ctx: EmojiContext, param: click.Parameter, value: str
-) -> ParseResult:
+    ctx: EmojiContext, param: click.Parameter, value: str | None
+) -> ParseResult | None:
     """Ensure URL contains minimum information to be used"""
+    if value is None:
+        return None
     url = urlparse(value)
     if not url.scheme or not url.hostname:
         raise click.BadParameter(f"Malformed URL: {value}")
     return url
 
 
+def iter_names(
+    names: Iterable[str], from_file: IO[str] | None = None
+) -> Iterator[tuple[str, dict[str, Any] | None]]:
+    """Stream Emoji names from arguments and files
+
+    A ``-`` argument reads names from the standard input.
+    Lines of files are either names or JSON Emoji metadata,
+    as printed by ``-o ndjson``, the metadata holding an ``id``
+    spares a lookup of the Emoji.
+
+    Yields
+    ------
+    tuple of (str, :obj:`dict`)
+        Emoji name, and its metadata if known
+    """
+    files = []
+    for name in names:
+        if name == "-":
+            files.append(("-", click.get_text_stream("stdin")))
+        else:
+            yield name, None
+    if from_file is not None:
+        files.append((getattr(from_file, "name", "-"), from_file))
+
+    for source, f in files:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith("{"):
+                yield line, None
+                continue
+            try:
+                metadata = json.loads(line)
+                name = str(metadata["name"])
+            except (ValueError, TypeError, KeyError) as e:
+                raise click.ClickException(
+                    f"{source}:{number}: Invalid emoji metadata"
+                ) from e
+            yield name, metadata if metadata.get("id") else None
+
+
+from_file_option = click.option(
+    "--from-file",
+    metavar="FILE",
+    type=click.File("r"),
+    help="also read emoji names from FILE ('-' for the standard input),"
+    " one per line, or emoji metadata as printed by `-o ndjson`",
+)
+
+
+def parse_shard(
+    ctx: click.Context, param: click.Parameter, value: str | None
+) -> Shard | None:
+    """Parse a shard such as ``2/4``, the second of four shards"""
+    if not value:
+        return None
+    try:
+        number, count = (int(part) for part in value.split("/"))
+    except ValueError as e:
+        raise click.BadParameter(f"Malformed shard: {value}") from e
+    if not 1 <= number <= count:
+        raise click.BadParameter(
+            f"Shard number must be between 1 and {max(count, 1)}: {value}"
+        )
+    return number, count
+
+
+shard_option = click.option(
+    "--shard",
+    metavar="I/N",
+    envvar="MMEMOJI_SHARD",
+    callback=parse_shard,
+    help="only process the emojis of the I-th of N shards,"
+    " partitioned by a stable hash of their name (env: MMEMOJI_SHARD)",
+)
+
+
+live_option = click.option(
+    "--live",
+    is_flag=True,
+    help="keep an index of the emojis up to date from the websocket"
+    " of the server, which spares lookups of absent emojis",
+)
+
+
+def split_servers(
+    ctx: EmojiContext, param: click.Parameter, value: str | None
+) -> list[str]:
+    """Split a comma-separated list of profile names"""
+    if not value:
+        return []
+    return [server.strip() for server in value.split(",") if server.strip()]
+
+
+class Profile(TypedDict):
+    url: ParseResult
+    token: str
+    login_id: str
+    password: str
+    mfa_token: str
+    insecure: bool
+
+
+def load_profiles(path: str, servers: list[str]) -> dict[str, Profile]:
+    """Load server profiles from an INI configuration file
+
+    Each section describes a server, for example:
+
+    .. code-block:: ini
+
+        [eu]
+        url = https://mattermost.eu.example.com
+        token = xxxxxxxxxxxxxxxxxxxxxxxxxx
+    """
+    config = configparser.ConfigParser(interpolation=None)
+    if not config.read(path):
+        raise click.ClickException(f"{path}: Unable to read configuration")
+
+    profiles: dict[str, Profile] = {}
+    for server in servers:
+        if not config.has_section(server):
+            raise click.ClickException(f'{path}: Unknown server "{server}"')
+        section = config[server]
+        url = urlparse(section.get("url", ""))
+        if not url.scheme or not url.hostname:
+            raise click.ClickException(
+                f'{path}: Malformed URL for server "{server}"'
+            )
+        profiles[server] = Profile(
+            url=url,
+            token=section.get("token", ""),
+            login_id=section.get("login_id", ""),
+            password=section.get("password", ""),
+            mfa_token=section.get("mfa_token", ""),
+            insecure=section.getboolean("insecure", False),
+        )
+    return profiles
+
+
+def resolve_profile(
+    path: str,
+    server: str,
+    token: str,
+    login_id: str,
+    password: str,
+    mfa_token: str,
+    insecure: bool,
+) -> Profile:
+    """Get a server profile by name from the configuration file,
+    or build one from a URL and the given credentials
+    """
+    if "://" not in server:
+        return load_profiles(path, [server])[server]
+    url = urlparse(server)
+    if not url.scheme or not url.hostname:
+        raise click.BadParameter(f"Malformed URL: {server}")
+    return Profile(
+        url=url,
+        token=token,
+        login_id=login_id,
+        password=password,
+        mfa_token=mfa_token,
+        insecure=insecure,
+    )
+
+
 def compose(
     *decorators: Decorator[R],
 ) -> Decorator[R]:
@@ -146,25 +498,33 @@ def compose(
 
 
 class GlobalOptions(TypedDict):
-    url: NotRequired[ParseResult]
+    url: NotRequired[ParseResult | None]
     token: NotRequired[str]
     login_id: NotRequired[str]
     password: NotRequired[str]
     mfa_token: NotRequired[str]
     insecure: NotRequired[bool]
     output: NotRequired[str]
+    servers: NotRequired[list[str]]
+    config: NotRequired[str]
+    metrics_file: NotRequired[str | None]
+    profile_file: NotRequired[str | None]
+    profile_format: NotRequired[str]
+    profile_memory: NotRequired[bool]
+
+
+config_option = click.option(
+    "--config",
+    metavar="FILE",
+    envvar="MMEMOJI_CONFIG",
+    type=click.Path(dir_okay=False),
+    default=os.path.join(click.get_app_dir("mmemoji"), "config.ini"),
+    show_default=True,
+    help="configuration file describing servers (env: MMEMOJI_CONFIG)",
+)
 
 
-global_options = compose(
-    click.option(
-        "-u",
-        "--url",
-        metavar="URL",
-        envvar="MM_URL",
-        callback=validate_url,
-        required=True,
-        help="Mattermost APIv4 URL (e.g http://localhost:8065) (env: MM_URL)",
-    ),
+credential_options = compose(
     click.option(
         "-t",
         "--token",
@@ -205,13 +565,151 @@ global_options = compose(
         help="allow insecure server connections when using SSL"
         " (env: MM_INSECURE)",
     ),
+)
+
+
+metrics_option = click.option(
+    "--metrics-file",
+    metavar="FILE",
+    envvar="MMEMOJI_METRICS_FILE",
+    type=click.Path(dir_okay=False),
+    help="write metrics of the run to FILE, in the Prometheus text format"
+    " (env: MMEMOJI_METRICS_FILE)",
+)
+
+
+profile_options = compose(
     click.option(
-        "--output",
-        "-o",
-        type=click.Choice(["json", "table"]),
-        default="table",
-        help="output format (default: table)",
+        "--profile",
+        "profile_file",
+        metavar="FILE",
+        envvar="MMEMOJI_PROFILE",
+        type=click.Path(dir_okay=False),
+        help="write a CPU profile of the command to FILE"
+        " (env: MMEMOJI_PROFILE)",
     ),
+    click.option(
+        "--profile-format",
+        envvar="MMEMOJI_PROFILE_FORMAT",
+        type=click.Choice(["pstats", "collapsed"]),
+        default="pstats",
+        help="pstats of the main thread,"
+        " or collapsed stacks sampled from all threads for flame graphs"
+        " (default: pstats) (env: MMEMOJI_PROFILE_FORMAT)",
+    ),
+    click.option(
+        "--profile-memory",
+        envvar="MMEMOJI_PROFILE_MEMORY",
+        is_flag=True,
+        help="report the peak memory usage with tracemalloc"
+        " (env: MMEMOJI_PROFILE_MEMORY)",
+    ),
+)
+
+
+output_option = click.option(
+    "--output",
+    "-o",
+    type=click.Choice(["json", "ndjson", "table"]),
+    default="table",
+    help="output format, ndjson prints one JSON object per line"
+    " (default: table)",
+)
+
+
+global_options = compose(
+    click.option(
+        "-u",
+        "--url",
+        metavar="URL",
+        envvar="MM_URL",
+        callback=validate_url,
+        help="Mattermost APIv4 URL (e.g http://localhost:8065) (env: MM_URL)",
+    ),
+    click.option(
+        "--servers",
+        metavar="NAME[,NAME...]",
+        envvar="MMEMOJI_SERVERS",
+        callback=split_servers,
+        help="run against the given servers from the configuration file"
+        " concurrently instead of --url (env: MMEMOJI_SERVERS)",
+    ),
+    config_option,
+    credential_options,
+    output_option,
+    metrics_option,
+    profile_options,
+)
+
+
+journal_option = click.option(
+    "--journal",
+    metavar="FILE",
+    type=click.Path(dir_okay=False),
+    help="record finished items in FILE,"
+    " and skip the ones it already holds when resuming",
+)
+
+
+keep_going_options = compose(
+    click.option(
+        "--keep-going",
+        is_flag=True,
+        help="carry on after an emoji fails, and report all failures"
+        " at the end",
+    ),
+    click.option(
+        "--failures",
+        "failures_path",
+        metavar="FILE",
+        type=click.Path(dir_okay=False),
+        help="record failed emojis in FILE as JSON lines,"
+        " with the error, HTTP status and error ID",
+    ),
+    click.option(
+        "--retry",
+        metavar="FILE",
+        type=click.Path(exists=True, dir_okay=False),
+        help="also process the failed emojis recorded in FILE by --failures",
+    ),
+)
+
+
+resolve_users_option = click.option(
+    "-U",
+    "--resolve-users",
+    is_flag=True,
+    help="add the username of the creator of each emoji",
+)
+
+
+dry_run_options = compose(
+    click.option(
+        "--dry-run",
+        is_flag=True,
+        help="print the planned operations and their cost,"
+        " without running them",
+    ),
+    click.option(
+        "--save-plan",
+        metavar="FILE",
+        type=click.Path(dir_okay=False),
+        help="save the planned operations as JSON to FILE"
+        " for `mmemoji apply` (implies --dry-run)",
+    ),
+)
+
+
+#: Global options selecting the server and authenticating against it
+SESSION_OPTIONS = (
+    "url",
+    "servers",
+    "config",
+    "token",
+    "login_id",
+    "password",
+    "mfa_token",
+    "insecure",
 )
 
 
@@ -222,8 +720,8 @@ global_options = compose(
 # This moves all global options to the subcommand which isn't that bad
 # This way all options are visible when asking for help on a subcommand
 def parse_global_options(
-    func: Callable[..., R],
-) -> Callable[Concatenate[EmojiContext, ...], R]:
+    func: Callable[..., None],
+) -> Callable[Concatenate[EmojiContext, ...], None]:
     """Parse options used by every commands such as auth and output format"""
 
     @wraps(global_options(func))
@@ -232,16 +730,63 @@ def parse_global_options(
         ctx: EmojiContext,
         *args: Any,  # noqa: ANN401
         **kwargs: Unpack[GlobalOptions],
-    ) -> R:
+    ) -> None:
         ctx.output = kwargs.pop("output")
-        with ctx.authenticate(
-            kwargs.pop("url"),
-            kwargs.pop("token"),
-            kwargs.pop("login_id"),
-            kwargs.pop("password"),
-            kwargs.pop("mfa_token"),
-            kwargs.pop("insecure"),
+        servers = kwargs.pop("servers")
+        config = kwargs.pop("config")
+        url = kwargs.pop("url")
+        token = kwargs.pop("token")
+        login_id = kwargs.pop("login_id")
+        password = kwargs.pop("password")
+        mfa_token = kwargs.pop("mfa_token")
+        insecure = kwargs.pop("insecure")
+        metrics_file = kwargs.pop("metrics_file")
+        profile_file = kwargs.pop("profile_file")
+        profile_format = kwargs.pop("profile_format")
+        profile_memory = kwargs.pop("profile_memory")
+
+        click_ctx = click.get_current_context()
+        # serve prefixes the name of the command with the program name
+        command = (click_ctx.info_name or "").rsplit(" ", 1)[-1]
+
+        if ctx.authenticated:
+            # Session is kept open by a long-lived command, e.g. serve,
+            # the options describing another one cannot apply
+            for name in SESSION_OPTIONS:
+                source = click_ctx.get_parameter_source(name)
+                if source is ParameterSource.COMMANDLINE:
+                    raise click.UsageError(
+                        f"--{name.replace('_', '-')}"
+                        " cannot be used within a session"
+                    )
+            with (
+                profile(profile_file, profile_format, profile_memory),
+                ctx.collect_metrics(metrics_file, command),
+            ):
+                func(ctx, *args, **kwargs)
+            return
+
+        with (
+            profile(profile_file, profile_format, profile_memory),
+            ctx.collect_metrics(metrics_file, command),
         ):
-            return func(ctx, *args, **kwargs)
+            if servers:
+                # These would be shared by the servers, which race on them
+                for option in ("interactive", "state", "save_plan"):
+                    if dict(kwargs).get(option):
+                        raise click.UsageError(
+                            f"--{option.replace('_', '-')}"
+                            " cannot be used with --servers"
+                        )
+                profiles = load_profiles(config, servers)
+                ctx.fan_out(profiles, func, *args, **kwargs)
+                return
+            if url is None:
+                raise click.UsageError("Missing option '-u' / '--url'.")
+
+            with ctx.authenticate(
+                url, token, login_id, password, mfa_token, insecure
+            ):
+                func(ctx, *args, **kwargs)
 
     return wrapper
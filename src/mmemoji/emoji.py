@@ -7,11 +7,14 @@ This wrapper is built around ``python-mattermostautodriver``_
 """
 
 import builtins
+import io
 import json
 import re
+from collections.abc import Iterator
 from os.path import basename
 from typing import Any, BinaryIO
 
+from filetype import filetype
 from mattermostautodriver import TypedDriver as Mattermost
 from mattermostautodriver.exceptions import (
     InvalidOrMissingParameters,
@@ -24,12 +27,18 @@ from mmemoji.exceptions import (
     EmojiNotFound,
     SystemEmojiConflict,
 )
+from mmemoji.registry import MetadataRegistry
 
 
 class Emoji:
     """Interact with Mattermost custom Emojis."""
 
-    def __init__(self, mattermost: Mattermost, name: str) -> None:
+    def __init__(
+        self,
+        mattermost: Mattermost,
+        name: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
         """Init Emoji class with a Mattermost client instance
         and an Emoji name.
 
@@ -40,10 +49,16 @@ class Emoji:
         name : str
             an Emoji name. It can be a file path,
             the filename will be automatically extracted and sanitized
+        metadata : :obj:`dict`, optional
+            Emoji metadata already retrieved from Mattermost,
+            an empty :obj:`dict` if the Emoji is known not to exist,
+            only kept by this instance
         """
         self._mm = mattermost
         self._name = self.sanitize_name(name)
-        self._metadata: dict[str, Any] = {}
+        self._registry = MetadataRegistry.for_driver(mattermost)
+        # None until looked up
+        self._metadata: dict[str, Any] | None = metadata
 
     @staticmethod
     def sanitize_name(filepath: str) -> str:
@@ -72,18 +87,27 @@ class Emoji:
     def _get_metadata_from_mattermost(self) -> bool:
         """Retrieve custom Emoji metadata from Mattermost."""
         try:
-            self._metadata = self._mm.emoji.get_emoji_by_name(self.name)
-            return True
+            metadata = self._mm.emoji.get_emoji_by_name(self.name)
         except ResourceNotFound:
-            self._metadata = {}
-            return False
+            metadata = {}
+        self._metadata = metadata
+        self._registry.set(self.name, metadata)
+        return bool(metadata)
 
     @property
     def metadata(self) -> dict[str, Any]:
-        """:obj:`dict` of (str: Any): Gets Emoji metadata."""
-        if not self._metadata:
-            self._get_metadata_from_mattermost()
-        return self._metadata
+        """:obj:`dict` of (str: Any): Gets Emoji metadata.
+
+        Lookups are shared through the :class:`MetadataRegistry`
+        of the driver, including the ones of absent Emojis.
+        """
+        if self._metadata is None:
+            cached = self._registry.get(self.name)
+            if cached is None:
+                self._get_metadata_from_mattermost()
+            else:
+                self._metadata = cached
+        return self._metadata or {}
 
     @property
     def name(self) -> str:
@@ -141,6 +165,7 @@ class Emoji:
                     return False
                 raise SystemEmojiConflict(self) from e
             raise e
+        self._registry.set(self._name, self._metadata)
         return True
 
     def delete(self, force: bool = False) -> bool:
@@ -166,16 +191,112 @@ class Emoji:
 
         if self.metadata:
             self._mm.emoji.delete_emoji(self.metadata.get("id", ""))
+            self._registry.set(self._name, {})
             return True
         else:
             raise EmojiNotFound(self)
 
+    def rename(self, new_name: str, force: bool = False) -> "Emoji":
+        """Rename a custom Emoji on Mattermost.
+
+        Mattermost cannot rename Emojis, so the image is copied in memory
+        to a new Emoji, and the old one is deleted only once
+        the new one is created.
+
+        Parameters
+        ----------
+        new_name : str
+            the new Emoji name
+        force: bool
+            delete the Emoji named ``new_name`` if it already exists
+
+        Returns
+        -------
+        :obj:`Emoji`
+            Returns the new Emoji
+
+        Raises
+        ------
+        EmojiNotFound
+            If Emoji does not exist
+        EmojiAlreadyExists
+            If ``new_name`` exists and ``force`` was not ``True``
+        """
+        new = Emoji(self._mm, new_name)
+        if new.name == self.name:
+            return self
+        new.create(io.BytesIO(self.download()), force=force)
+        if not new.metadata:
+            raise EmojiNotFound(new)
+        self.delete()
+        return new
+
+    @staticmethod
+    def iterate(
+        mattermost: Mattermost,
+        page: int = 0,
+        per_page: int = 200,
+        sort: str = "name",
+        since: int = 0,
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate over custom Emojis on Mattermost, one page at a time.
+
+        Parameters
+        ----------
+        mattermost : :obj:`mattermostautodriver.Driver`
+            an instance of `mattermostautodriver`_
+        page: int
+            The page to start from.
+        per_page: int
+            The number of emojis per page.
+        sort: string
+            Either blank for no sorting or "name" to sort by emoji names.
+        since: int
+            Only yield Emojis created or updated strictly after this
+            timestamp (milliseconds since the epoch).
+            The API can neither filter nor sort by date,
+            so every page is still fetched, but nothing is accumulated.
+
+        Yields
+        ------
+        :obj:`dict`
+            Emoji metadata
+        """
+        while True:
+            metadata_page = mattermost.emoji.get_emoji_list(
+                page, per_page, sort
+            )
+            for metadata in metadata_page:
+                if Emoji.updated_at(metadata) > since:
+                    yield metadata
+            if len(metadata_page) < per_page:
+                break
+            page += 1
+
+    @staticmethod
+    def updated_at(metadata: dict[str, Any]) -> int:
+        """Get the last modification timestamp of an Emoji.
+
+        Parameters
+        ----------
+        metadata : :obj:`dict`
+            Emoji metadata
+
+        Returns
+        -------
+        int
+            Latest of ``create_at`` and ``update_at``
+            (milliseconds since the epoch)
+        """
+        return max(metadata.get("create_at", 0), metadata.get("update_at", 0))
+
     @staticmethod
     def list(
         mattermost: Mattermost,
         page: int = 0,
         per_page: int = 200,
         sort: str = "name",
+        since: int = 0,
     ) -> builtins.list[dict[str, Any]]:
         """List custom Emojis on Mattermost.
 
@@ -189,24 +310,18 @@ class Emoji:
             The number of users per page.
         sort: string
             Either blank for no sorting or "name" to sort by emoji names.
+        since: int
+            Only list Emojis created or updated strictly after this
+            timestamp (milliseconds since the epoch).
 
         Returns
         -------
         :obj:`list` of `dict`
             Returns a list of Emoji metadata
         """
-        metadata_list = []
-        previous_count = 0
-        while True:
-            metadata_list += mattermost.emoji.get_emoji_list(
-                page, per_page, sort
-            )
-            count = len(metadata_list)
-            if count - previous_count < per_page:
-                break
-            page += 1
-            previous_count = count
-        return metadata_list
+        return builtins.list(
+            Emoji.iterate(mattermost, page, per_page, sort, since)
+        )
 
     @staticmethod
     def search(
@@ -251,3 +366,43 @@ class Emoji:
         if self.metadata and "id" in self.metadata:
             return self._mm.emoji.get_emoji_image(self.metadata["id"]).content
         raise EmojiNotFound(self)
+
+    def probe(self, length: int = 262) -> tuple[int, str | None]:
+        """Get the size and format of a custom Emoji image
+        without downloading it.
+
+        Only the first bytes of the image are requested,
+        the server reports the full size in the ``Content-Range`` header.
+
+        Parameters
+        ----------
+        length : int
+            number of bytes to request to detect the format
+
+        Returns
+        -------
+        tuple of (int, str or None)
+            Returns the image size in bytes,
+            and its extension (e.g. ``png``) if it is recognized
+
+        Raises
+        ------
+        EmojiNotFound
+            If Emoji does not exist
+        """
+        if not self.metadata or "id" not in self.metadata:
+            raise EmojiNotFound(self)
+        client = self._mm.client
+        response = client.client.get(
+            f"{client.url}/emoji/{self.metadata['id']}/image",
+            headers={
+                **(client.auth_header() or {}),
+                "Range": f"bytes=0-{length - 1}",
+            },
+        )
+        response.raise_for_status()
+        size = len(response.content)
+        content_range = response.headers.get("Content-Range", "")
+        if response.status_code == 206 and "/" in content_range:
+            size = int(content_range.rsplit("/", 1)[1])
+        return size, filetype.guess_extension(response.content)
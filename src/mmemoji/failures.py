@@ -0,0 +1,151 @@
+"""Failure reports to retry only the failed items of bulk operations.
+
+Failures are written as JSON lines, with the failed item,
+the exception, the HTTP status and the Mattermost error ID,
+the report can then be given back as input to retry the failed items.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Any
+
+from httpx import HTTPError
+
+if sys.version_info < (3, 11):
+    from typing_extensions import Self
+else:
+    from typing import Self
+
+# Reports of several servers may share a file, see EmojiContext.fan_out()
+_lock = threading.Lock()
+
+
+def describe(error: Exception) -> dict[str, Any]:
+    """Describe an exception as a JSON-serializable dict"""
+    return {
+        "exception": type(error).__name__,
+        # Set on every exception raised by mattermostautodriver
+        "status": getattr(error, "status_code", None),
+        "error_id": getattr(error, "error_id", None) or None,
+        "error": error.args[0] if error.args != () else repr(error),
+    }
+
+
+def _read(path: str) -> list[dict[str, Any]]:
+    entries = []
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                entries.append(entry)
+    return entries
+
+
+def read_failures(path: str | None, scope: str) -> list[str]:
+    """Read the failed items of an operation from a failure report
+
+    Parameters
+    ----------
+    path : str, optional
+        failure report path, no items are returned if ``None``
+    scope : str
+        operation the items belong to (e.g. ``create``)
+
+    Returns
+    -------
+    :obj:`list` of str
+        Failed items, in the order they were processed
+    """
+    if path is None:
+        return []
+    return [
+        str(entry["item"])
+        for entry in _read(path)
+        if entry.get("scope") == scope and "item" in entry
+    ]
+
+
+class FailureReport:
+    """Collect the failures of the items of an operation."""
+
+    def __init__(
+        self, path: str | None, scope: str, keep_going: bool = False
+    ) -> None:
+        """Init FailureReport class.
+
+        Parameters
+        ----------
+        path : str, optional
+            report file path, failures are only kept in memory if ``None``
+        scope : str
+            operation the items belong to (e.g. ``create``),
+            failures of other scopes are kept in the file
+        keep_going : bool
+            carry on with the next item after a failure,
+            instead of raising the exception
+        """
+        self.path = path
+        self.scope = scope
+        self.keep_going = keep_going
+        self.failures: list[dict[str, Any]] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.write()
+
+    def __len__(self) -> int:
+        return len(self.failures)
+
+    @contextmanager
+    def catch(self, item: str) -> Iterator[None]:
+        """Record the failure of an item processed in the block"""
+        try:
+            yield
+        except (HTTPError, OSError) as e:
+            self.failures.append(
+                {"scope": self.scope, "item": item, **describe(e)}
+            )
+            if not self.keep_going:
+                raise
+
+    def write(self) -> None:
+        """Atomically replace the failures of the scope in the report"""
+        if self.path is None:
+            return
+        with _lock:
+            entries = []
+            if os.path.exists(self.path):
+                entries = [
+                    entry
+                    for entry in _read(self.path)
+                    if entry.get("scope") != self.scope
+                ]
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                for entry in entries + self.failures:
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.path)
+
+    def summary(self) -> str:
+        """Describe the failures in a human-readable way"""
+        lines = [f"{f['item']}: {f['error']}" for f in self.failures]
+        count = len(self.failures)
+        lines.append(f"{count} emoji{'' if count == 1 else 's'} failed")
+        if self.path is not None:
+            lines[-1] += f", retry them with --retry {self.path}"
+        return "\n".join(lines)
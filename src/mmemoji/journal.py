@@ -0,0 +1,106 @@
+"""Progress journal to resume interrupted bulk operations.
+
+Finished items are appended to the journal as JSON lines,
+a rerun with the same journal skips them without any API call.
+"""
+
+import json
+import os
+import sys
+from types import TracebackType
+from typing import IO
+
+if sys.version_info < (3, 11):
+    from typing_extensions import Self
+else:
+    from typing import Self
+
+
+class Journal:
+    """Append-only record of finished items."""
+
+    def __init__(
+        self, path: str | None, scope: str, sync_every: int = 100
+    ) -> None:
+        """Init Journal class.
+
+        Parameters
+        ----------
+        path : str, optional
+            journal file path, nothing is recorded if ``None``
+        scope : str
+            operation the items belong to (e.g. ``create``),
+            entries of other scopes are ignored
+        sync_every : int
+            number of items to append before syncing the file to disk
+        """
+        self.path = path
+        self.scope = scope
+        self.sync_every = sync_every
+        self._finished: set[str] = set()
+        self._pending = 0
+        self._file: IO[str] | None = None
+
+    def __enter__(self) -> Self:
+        if self.path is None:
+            return self
+        line = "\n"
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Last line may be truncated by an interruption
+                        continue
+                    if (
+                        isinstance(entry, dict)
+                        and entry.get("scope") == self.scope
+                        and "item" in entry
+                    ):
+                        self._finished.add(entry["item"])
+        self._file = open(self.path, "a")
+        if not line.endswith("\n"):
+            # Terminate the truncated line before appending
+            self._file.write("\n")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._finished
+
+    def add(self, item: str) -> None:
+        """Record an item as finished.
+
+        Parameters
+        ----------
+        item : str
+            item identifier (e.g. file path or Emoji name)
+        """
+        self._finished.add(item)
+        if self._file is None:
+            return
+        self._file.write(
+            json.dumps({"scope": self.scope, "item": item}) + "\n"
+        )
+        self._pending += 1
+        if self._pending >= self.sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush pending entries to disk."""
+        if self._file is None or not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
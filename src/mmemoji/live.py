@@ -0,0 +1,340 @@
+"""Live index of custom Emojis, kept up to date by the websocket of the server.
+
+Mattermost pushes an ``emoji_added`` event on its websocket whenever
+a custom Emoji is created. :class:`EmojiListener` applies these events
+to an :class:`EmojiIndex` and to the metadata registry of the driver,
+so that long-lived sessions do not need to poll the API.
+
+Deletions are not pushed by the server. They are caught up, along with any
+event missed while disconnected, by resynchronizing the index after each
+connection and periodically. The websocket of the driver reconnects on its
+own, and a connection on which the server does not answer a ping is
+considered dead and reopened.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
+from types import TracebackType
+from typing import Any
+
+from aiohttp import ClientWebSocketResponse
+from httpx import HTTPError
+from mattermostautodriver import TypedDriver as Mattermost
+from mattermostautodriver.websocket import Websocket
+
+from mmemoji.emoji import Emoji
+from mmemoji.registry import MetadataRegistry
+
+if sys.version_info < (3, 11):
+    from typing_extensions import Self
+else:
+    from typing import Self
+
+logger = logging.getLogger(__name__)
+
+#: Delay in seconds without receiving anything before pinging the server
+PING_INTERVAL = 60.0
+
+
+class EmojiIndex:
+    """Custom Emoji metadata by name, optionally persisted to a file."""
+
+    def __init__(self, path: str | None = None) -> None:
+        """Init EmojiIndex class.
+
+        Parameters
+        ----------
+        path : str, optional
+            JSON file the index is loaded from and saved to,
+            the index is only kept in memory if ``None``
+        """
+        self.path = path
+        #: Whether the index is complete and kept up to date,
+        #: i.e. Emojis absent from it do not exist
+        self.live = False
+        self._emojis: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path is not None:
+            self.load()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._emojis
+
+    def __len__(self) -> int:
+        return len(self._emojis)
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        """Get the metadata of an Emoji, ``None`` if not indexed"""
+        return self._emojis.get(name)
+
+    def names(self) -> list[str]:
+        """Get the sorted names of the indexed Emojis"""
+        with self._lock:
+            return sorted(self._emojis)
+
+    def add(self, metadata: dict[str, Any]) -> bool:
+        """Add or update an Emoji, return ``True`` if the index changed"""
+        with self._lock:
+            if self._emojis.get(metadata["name"]) == metadata:
+                return False
+            self._emojis[metadata["name"]] = metadata
+            return True
+
+    def replace(
+        self, emojis: Iterable[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], list[str]]:
+        """Replace the indexed Emojis
+
+        Parameters
+        ----------
+        emojis : :obj:`list` of :obj:`dict`
+            metadata of all Emojis
+
+        Returns
+        -------
+        :obj:`tuple` of (:obj:`list` of :obj:`dict`, :obj:`list` of str)
+            Metadata of the added or updated Emojis,
+            and names of the removed ones
+        """
+        emojis = {metadata["name"]: metadata for metadata in emojis}
+        with self._lock:
+            changed = [
+                metadata
+                for name, metadata in sorted(emojis.items())
+                if self._emojis.get(name) != metadata
+            ]
+            removed = sorted(self._emojis.keys() - emojis.keys())
+            self._emojis = emojis
+        return changed, removed
+
+    def load(self) -> None:
+        """Load the index from its file, left empty if unreadable"""
+        if self.path is None:
+            return
+        try:
+            with open(self.path) as f:
+                emojis = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(emojis, list):
+            self.replace(
+                metadata
+                for metadata in emojis
+                if isinstance(metadata, dict) and "name" in metadata
+            )
+
+    def save(self) -> None:
+        """Atomically replace the file of the index, if any"""
+        if self.path is None:
+            return
+        with self._lock:
+            emojis = [self._emojis[name] for name in sorted(self._emojis)]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(emojis, f)
+        os.replace(tmp_path, self.path)
+
+
+class _Websocket(Websocket):
+    """Websocket of the driver, reporting the end of each connection."""
+
+    def __init__(
+        self,
+        options: dict[str, Any],
+        token: str,
+        on_disconnect: Callable[[], None],
+    ) -> None:
+        super().__init__(options, token)
+        self.on_disconnect = on_disconnect
+
+    async def _start_loop(
+        self,
+        websocket: ClientWebSocketResponse,
+        event_handler: Callable[[str], Awaitable[None]],
+    ) -> None:
+        try:
+            await super()._start_loop(websocket, event_handler)
+        finally:
+            self.on_disconnect()
+
+
+class EmojiListener(threading.Thread):
+    """Keep an index of the custom Emojis up to date in the background."""
+
+    def __init__(
+        self,
+        mattermost: Mattermost,
+        index: EmojiIndex | None = None,
+        resync_interval: float = 60.0,
+        on_change: (
+            Callable[[list[dict[str, Any]], list[str]], None] | None
+        ) = None,
+        heartbeat: float = PING_INTERVAL,
+    ) -> None:
+        """Init EmojiListener class with a Mattermost client instance.
+
+        Parameters
+        ----------
+        mattermost : :obj:`mattermostautodriver.Driver`
+            an authenticated instance of `mattermostautodriver`_
+        index : :obj:`EmojiIndex`, optional
+            index to keep up to date, a new one is kept in memory by default
+        resync_interval : float
+            delay in seconds between two resynchronizations,
+            which catch up the deletions the server does not push
+        on_change : callable, optional
+            called with the metadata of the added or updated Emojis
+            and the names of the removed ones, after each change
+        heartbeat : float
+            delay in seconds without receiving anything before pinging
+            the server, the connection is reopened if it does not answer
+            within half of it
+        """
+        super().__init__(name="mmemoji-listener", daemon=True)
+        self._mm = mattermost
+        self.index = index if index is not None else EmojiIndex()
+        self.resync_interval = resync_interval
+        self.on_change = on_change
+        self.heartbeat = heartbeat
+        #: Delay in seconds between two checks for a stop request
+        self.poll_interval = 1.0
+        #: Set while connected to the websocket
+        self.connected = threading.Event()
+        self.registry = MetadataRegistry.for_driver(mattermost)
+        self._stop_event = threading.Event()
+        self._last_resync: float | None = None
+
+    def start(self) -> None:
+        # Absent Emojis are looked up in the index once it is live
+        self.registry.index = self.index
+        super().start()
+
+    def stop(self) -> None:
+        """Stop listening and wait for the thread to finish"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+        self.index.live = False
+        if self.registry.index is self.index:
+            self.registry.index = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def resync(self) -> bool:
+        """Catch up with the custom Emojis of the server
+
+        Returns
+        -------
+        bool
+            ``True`` if the index is up to date,
+            ``False`` if the Emojis could not be listed
+        """
+        self._last_resync = time.monotonic()
+        try:
+            emojis = list(Emoji.iterate(self._mm))
+        except HTTPError as e:
+            logger.warning("Unable to resynchronize the emoji index: %s", e)
+            return False
+        changed, removed = self.index.replace(emojis)
+        for name in removed:
+            self.registry.set(name, {})
+        self._changed(changed, removed)
+        return True
+
+    def handle(self, message: str) -> None:
+        """Apply a websocket event to the index"""
+        try:
+            event = json.loads(message)
+            if not isinstance(event, dict):
+                return
+            if event.get("event") == "hello":
+                # Sent once the connection is authenticated,
+                # events are buffered by the socket while resynchronizing
+                self.connected.set()
+                self.index.live = self.resync()
+                return
+            if event.get("event") != "emoji_added":
+                return
+            # The Emoji is serialized as JSON within the event
+            metadata = event.get("data", {}).get("emoji")
+            if isinstance(metadata, str):
+                metadata = json.loads(metadata)
+        except (AttributeError, ValueError):
+            logger.warning("Invalid websocket event: %s", message[:200])
+            return
+        if not isinstance(metadata, dict) or "name" not in metadata:
+            return
+        self.registry.set(metadata["name"], metadata)
+        if self.index.add(metadata):
+            self._changed([metadata], [])
+
+    def _changed(
+        self, changed: list[dict[str, Any]], removed: list[str]
+    ) -> None:
+        if not changed and not removed:
+            return
+        try:
+            self.index.save()
+        except OSError as e:
+            logger.warning("Unable to save the emoji index: %s", e)
+        if self.on_change is not None:
+            self.on_change(changed, removed)
+
+    def _disconnected(self) -> None:
+        self.index.live = False
+        self.connected.clear()
+
+    def _resync_due(self) -> bool:
+        return (
+            self._last_resync is None
+            or time.monotonic() - self._last_resync >= self.resync_interval
+        )
+
+    def run(self) -> None:
+        # The thread runs its own event loop
+        asyncio.run(self._listen())
+
+    async def _listen(self) -> None:
+        options: dict[str, Any] = dict(self._mm.options)
+        kw_args: dict[str, Any] = options["websocket_kw_args"] or {}
+        # Reconnect after keepalive_delay whenever disconnected
+        options["keepalive"] = True
+        options["websocket_kw_args"] = {"heartbeat": self.heartbeat, **kw_args}
+        websocket = _Websocket(
+            options, self._mm.client.token, self._disconnected
+        )
+
+        async def event_handler(message: str) -> None:
+            self.handle(message)
+
+        task = asyncio.create_task(websocket.connect(event_handler))
+        try:
+            while not self._stop_event.is_set():
+                await asyncio.sleep(self.poll_interval)
+                if self._resync_due():
+                    # Periodically, or as a fallback while disconnected
+                    live = self.resync()
+                    self.index.live = live and self.connected.is_set()
+        finally:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+            self._disconnected()
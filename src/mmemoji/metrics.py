@@ -0,0 +1,252 @@
+"""Metrics of a run in the Prometheus text format.
+
+Requests are observed through event hooks of the HTTP client
+of the driver, and the metrics are written once the command finishes,
+for the textfile collector of the Prometheus node exporter.
+"""
+
+import bisect
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+import httpx
+
+#: Upper bounds in seconds of the request latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ID = re.compile(r"/[a-z0-9]{26}(?=/|$)")
+_NAME = re.compile(r"/emoji/name/[^/]+")
+
+
+def endpoint(path: str) -> str:
+    """Turn a request path into a low cardinality endpoint label
+
+    For example ``/api/v4/emoji/name/parrot`` becomes
+    ``/api/v4/emoji/name/{name}``.
+    """
+    return _NAME.sub("/emoji/name/{name}", _ID.sub("/{id}", path))
+
+
+def _labels(**labels: Any) -> str:  # noqa: ANN401
+    escaped = (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        for value in labels.values()
+    )
+    return ",".join(
+        f'{name}="{value}"'
+        for name, value in zip(labels, escaped, strict=True)
+    )
+
+
+class Metrics:
+    """Collect the metrics of a run."""
+
+    def __init__(self, command: str) -> None:
+        """Init Metrics class.
+
+        Parameters
+        ----------
+        command : str
+            name of the command, added as a label to every metric
+        """
+        self.command = command
+        self.start = time.monotonic()
+        self.duration: float | None = None
+        self.success: bool | None = None
+        self.requests: Counter[tuple[str, str, int]] = Counter()
+        self.latencies: dict[tuple[str, str], list[int]] = {}
+        self.latency_sums: Counter[tuple[str, str]] = Counter()
+        self.latency_counts: Counter[tuple[str, str]] = Counter()
+        self.items: Counter[str] = Counter()
+        self.bytes: Counter[str] = Counter()
+        self.ratelimit_remaining: int | None = None
+        self._started: dict[httpx.Request, float] = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, client: httpx.Client) -> None:
+        """Observe the requests made by an HTTP client"""
+        hooks = client.event_hooks
+        hooks["request"] = [*hooks.get("request", []), self._on_request]
+        hooks["response"] = [*hooks.get("response", []), self._on_response]
+        client.event_hooks = hooks
+
+    def uninstrument(self, client: httpx.Client) -> None:
+        """Stop observing the requests made by an HTTP client"""
+        hooks = client.event_hooks
+        for event, hook in (
+            ("request", self._on_request),
+            ("response", self._on_response),
+        ):
+            hooks[event] = [h for h in hooks.get(event, []) if h != hook]
+        client.event_hooks = hooks
+
+    def _on_request(self, request: httpx.Request) -> None:
+        self._started[request] = time.perf_counter()
+
+    def _on_response(self, response: httpx.Response) -> None:
+        # Time to the response headers, the body may be streamed
+        request = response.request
+        started = self._started.pop(request, None)
+        elapsed = 0.0 if started is None else time.perf_counter() - started
+        key = (request.method, endpoint(request.url.path))
+        remaining = response.headers.get("x-ratelimit-remaining")
+        with self._lock:
+            self.requests[(*key, response.status_code)] += 1
+            buckets = self.latencies.setdefault(key, [0] * len(BUCKETS))
+            index = bisect.bisect_left(BUCKETS, elapsed)
+            if index < len(BUCKETS):
+                buckets[index] += 1
+            self.latency_sums[key] += elapsed
+            self.latency_counts[key] += 1
+            self.bytes["sent"] += int(request.headers.get("content-length", 0))
+            self.bytes["received"] += int(
+                response.headers.get("content-length", 0)
+            )
+            if remaining is not None and remaining.isdigit():
+                self.ratelimit_remaining = int(remaining)
+
+    def add_items(self, outcome: str, count: int = 1) -> None:
+        """Account for items processed by the command
+
+        Parameters
+        ----------
+        outcome : str
+            e.g. ``succeeded`` or ``failed``
+        count : int
+            number of items
+        """
+        with self._lock:
+            self.items[outcome] += count
+
+    def finish(self, success: bool) -> None:
+        """Record the end of the run"""
+        self.duration = time.monotonic() - self.start
+        self.success = success
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text format"""
+        lines: list[str] = []
+        command = self.command
+
+        def family(name: str, kind: str, help_: str) -> None:
+            lines.append(f"# HELP {name} {help_}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            family(
+                "mmemoji_requests_total",
+                "counter",
+                "HTTP requests made to the Mattermost API.",
+            )
+            for (method, path, status), count in sorted(self.requests.items()):
+                labels = _labels(
+                    command=command,
+                    method=method,
+                    endpoint=path,
+                    status=status,
+                )
+                lines.append(f"mmemoji_requests_total{{{labels}}} {count}")
+
+            family(
+                "mmemoji_request_duration_seconds",
+                "histogram",
+                "Time to the response headers of the Mattermost API.",
+            )
+            for (method, path), buckets in sorted(self.latencies.items()):
+                labels = _labels(command=command, method=method, endpoint=path)
+                cumulative = 0
+                for bound, count in zip(BUCKETS, buckets, strict=True):
+                    cumulative += count
+                    lines.append(
+                        "mmemoji_request_duration_seconds_bucket"
+                        f'{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                total = self.latency_counts[(method, path)]
+                lines.append(
+                    "mmemoji_request_duration_seconds_bucket"
+                    f'{{{labels},le="+Inf"}} {total}'
+                )
+                lines.append(
+                    f"mmemoji_request_duration_seconds_sum{{{labels}}}"
+                    f" {self.latency_sums[(method, path)]:.6f}"
+                )
+                lines.append(
+                    f"mmemoji_request_duration_seconds_count{{{labels}}}"
+                    f" {total}"
+                )
+
+            family(
+                "mmemoji_items_total",
+                "counter",
+                "Emojis processed by the command, per outcome.",
+            )
+            for outcome, count in sorted(self.items.items()):
+                labels = _labels(command=command, outcome=outcome)
+                lines.append(f"mmemoji_items_total{{{labels}}} {count}")
+
+            family(
+                "mmemoji_bytes_total",
+                "counter",
+                "Bytes of request and response bodies.",
+            )
+            for direction in ("sent", "received"):
+                labels = _labels(command=command, direction=direction)
+                lines.append(
+                    f"mmemoji_bytes_total{{{labels}}} {self.bytes[direction]}"
+                )
+
+            if self.ratelimit_remaining is not None:
+                family(
+                    "mmemoji_ratelimit_remaining",
+                    "gauge",
+                    "Requests left in the rate limit window"
+                    " at the end of the run.",
+                )
+                lines.append(
+                    "mmemoji_ratelimit_remaining"
+                    f"{{{_labels(command=command)}}}"
+                    f" {self.ratelimit_remaining}"
+                )
+
+        labels = _labels(command=command)
+        if self.duration is not None:
+            family(
+                "mmemoji_run_duration_seconds",
+                "gauge",
+                "Duration of the run.",
+            )
+            lines.append(
+                f"mmemoji_run_duration_seconds{{{labels}}} {self.duration:.6f}"
+            )
+        if self.success is not None:
+            family(
+                "mmemoji_run_success",
+                "gauge",
+                "Whether the run succeeded.",
+            )
+            lines.append(
+                f"mmemoji_run_success{{{labels}}} {int(self.success)}"
+            )
+        family(
+            "mmemoji_run_timestamp_seconds",
+            "gauge",
+            "Time the metrics were written, in seconds since the epoch.",
+        )
+        lines.append(
+            f"mmemoji_run_timestamp_seconds{{{labels}}} {time.time():.3f}"
+        )
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Atomically replace a textfile with the metrics"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
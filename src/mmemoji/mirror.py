@@ -0,0 +1,144 @@
+"""Keep a local directory in sync with the custom Emojis of a server.
+
+A sidecar index records the ID and last modification of every mirrored
+Emoji, so that a sync costs one walk of the Emoji list plus the images
+which were added or changed since the previous sync.
+"""
+
+import json
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from filetype import filetype
+from mattermostautodriver import TypedDriver as Mattermost
+
+from mmemoji.emoji import Emoji
+from mmemoji.sharding import Shard, in_shard
+
+#: Name of the index file in the mirrored directory
+INDEX = ".mmemoji-index.json"
+
+
+def write_atomically(path: str, data: bytes) -> None:
+    """Write a file so that readers never see it partially written"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def read_index(directory: str) -> dict[str, dict[str, Any]]:
+    """Read the index of a mirrored directory"""
+    try:
+        with open(os.path.join(directory, INDEX)) as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        # Corrupted index, everything will be downloaded again
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def write_index(directory: str, index: dict[str, dict[str, Any]]) -> None:
+    """Atomically replace the index of a mirrored directory"""
+    write_atomically(
+        os.path.join(directory, INDEX),
+        json.dumps(index, indent=2, sort_keys=True).encode(),
+    )
+
+
+def mirror(
+    mattermost: Mattermost,
+    directory: str,
+    max_workers: int = 8,
+    on_change: Callable[[dict[str, Any]], None] | None = None,
+    shard: Shard | None = None,
+) -> list[dict[str, Any]]:
+    """Synchronize a directory with the custom Emojis of a server.
+
+    Parameters
+    ----------
+    mattermost : :obj:`mattermostautodriver.Driver`
+        an instance of `mattermostautodriver`_
+    directory : str
+        existing directory to synchronize
+    max_workers : int
+        maximum number of concurrent downloads
+    on_change : callable, optional
+        called with each change as soon as it is applied
+    shard : tuple of (int, int), optional
+        only synchronize the Emojis of this shard,
+        files of the other shards are left untouched
+
+    Returns
+    -------
+    :obj:`list` of `dict`
+        Changes, with the Emoji ``name``, the ``action``
+        (``added``, ``updated`` or ``removed``) and the ``file``
+    """
+    index = read_index(directory)
+    current = {
+        m["name"]: m
+        for m in Emoji.iterate(mattermost)
+        if in_shard(m["name"], shard)
+    }
+    changes: list[dict[str, Any]] = []
+
+    def record(change: dict[str, Any]) -> None:
+        changes.append(change)
+        if on_change is not None:
+            on_change(change)
+
+    def fetch(metadata: dict[str, Any]) -> dict[str, Any]:
+        name = metadata["name"]
+        image = Emoji(mattermost, name, metadata).download()
+        filename = f"{name}.{filetype.guess_extension(image)}"
+        write_atomically(os.path.join(directory, filename), image)
+        return {
+            "id": metadata["id"],
+            "update_at": Emoji.updated_at(metadata),
+            "file": filename,
+        }
+
+    outdated = [
+        metadata
+        for name, metadata in current.items()
+        if name not in index
+        or index[name].get("id") != metadata["id"]
+        or index[name].get("update_at") != Emoji.updated_at(metadata)
+        or not os.path.isfile(
+            os.path.join(directory, index[name].get("file", ""))
+        )
+    ]
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for metadata, entry in zip(
+                outdated, executor.map(fetch, outdated), strict=True
+            ):
+                name = metadata["name"]
+                previous = index.get(name)
+                if previous and previous.get("file") != entry["file"]:
+                    _remove(directory, previous.get("file", ""))
+                index[name] = entry
+                action = "updated" if previous else "added"
+                record({"name": name, "action": action, "file": entry["file"]})
+
+        removed = {name for name in index if in_shard(name, shard)}
+        for name in sorted(removed - current.keys()):
+            filename = index.pop(name).get("file", "")
+            _remove(directory, filename)
+            record({"name": name, "action": "removed", "file": filename})
+    finally:
+        # Keep track of the progress, even partial
+        write_index(directory, index)
+    return changes
+
+
+def _remove(directory: str, filename: str) -> None:
+    path = os.path.join(directory, filename)
+    if os.path.isfile(path):
+        os.unlink(path)
@@ -0,0 +1,173 @@
+"""Plan the operations of a bulk command without running them.
+
+A plan is computed from a single walk of the Emoji list and local file
+stats, it can be saved as JSON and executed later with ``mmemoji apply``.
+"""
+
+import json
+import os
+import sys
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any, TypedDict
+
+from mattermostautodriver import TypedDriver as Mattermost
+
+from mmemoji.emoji import Emoji
+
+if sys.version_info < (3, 11):
+    from typing_extensions import NotRequired
+else:
+    from typing import NotRequired
+
+#: Number of API calls needed by each action
+REQUESTS = {
+    "create": 1,
+    "overwrite": 2,
+    "delete": 1,
+    "skip": 0,
+    "conflict": 0,
+    "missing": 0,
+}
+
+
+class Operation(TypedDict):
+    #: One of :data:`REQUESTS` keys
+    action: str
+    #: Emoji name
+    name: str
+    #: Absolute path of the image to upload
+    path: NotRequired[str]
+    #: Size of the image to upload in bytes
+    size: NotRequired[int]
+    #: ID of the existing Emoji
+    id: NotRequired[str]
+    #: Last modification timestamp of the existing Emoji
+    update_at: NotRequired[int]
+
+
+def existing_emojis(mattermost: Mattermost) -> dict[str, dict[str, Any]]:
+    """Index the metadata of all custom Emojis by name"""
+    return {m["name"]: m for m in Emoji.iterate(mattermost)}
+
+
+def _operation(
+    action: str, name: str, metadata: dict[str, Any] | None
+) -> Operation:
+    operation = Operation(action=action, name=name)
+    if metadata:
+        operation["id"] = metadata["id"]
+        operation["update_at"] = Emoji.updated_at(metadata)
+    return operation
+
+
+def plan_create(
+    mattermost: Mattermost,
+    images: Iterable[str],
+    force: bool = False,
+    no_clobber: bool = False,
+) -> list[Operation]:
+    """Plan the creation of custom Emojis from image files.
+
+    Parameters
+    ----------
+    mattermost : :obj:`mattermostautodriver.Driver`
+        an instance of `mattermostautodriver`_
+    images : :obj:`list` of str
+        image file paths
+    force: bool
+        overwrite existing Emojis (ignored if ``no_clobber is ``True``)
+    no_clobber: bool
+        skip existing Emojis
+
+    Returns
+    -------
+    :obj:`list` of :obj:`Operation`
+        Planned operations in the same order as ``images``
+    """
+    existing = existing_emojis(mattermost)
+    planned: set[str] = set()
+    operations = []
+    for image in images:
+        name = Emoji.sanitize_name(image)
+        metadata = existing.get(name)
+        if not metadata and name not in planned:
+            action = "create"
+        elif no_clobber:
+            action = "skip"
+        elif force:
+            action = "overwrite"
+        else:
+            action = "conflict"
+
+        operation = _operation(action, name, metadata)
+        if action in ("create", "overwrite"):
+            path = os.path.abspath(image)
+            operation["path"] = path
+            operation["size"] = os.stat(path).st_size
+            planned.add(name)
+        operations.append(operation)
+    return operations
+
+
+def plan_delete(
+    mattermost: Mattermost, names: Iterable[str], force: bool = False
+) -> list[Operation]:
+    """Plan the deletion of custom Emojis.
+
+    Parameters
+    ----------
+    mattermost : :obj:`mattermostautodriver.Driver`
+        an instance of `mattermostautodriver`_
+    names : :obj:`list` of str
+        Emoji names or file paths
+    force: bool
+        ignore non-existent Emojis
+
+    Returns
+    -------
+    :obj:`list` of :obj:`Operation`
+        Planned operations in the same order as ``names``
+    """
+    existing = existing_emojis(mattermost)
+    operations = []
+    for item in names:
+        name = Emoji.sanitize_name(item)
+        metadata = existing.pop(name, None)
+        if metadata:
+            action = "delete"
+        elif force:
+            action = "skip"
+        else:
+            action = "missing"
+        operations.append(_operation(action, name, metadata))
+    return operations
+
+
+def summarize(operations: Iterable[Operation]) -> str:
+    """Describe what a plan does and what it costs"""
+    actions: Counter[str] = Counter()
+    requests = 0
+    size = 0
+    for operation in operations:
+        actions[operation["action"]] += 1
+        requests += REQUESTS[operation["action"]]
+        size += operation.get("size", 0)
+    counts = ", ".join(f"{n} {action}" for action, n in actions.items())
+    return (
+        f"Plan: {counts or 'nothing to do'}"
+        f" ({requests} request{'' if requests == 1 else 's'},"
+        f" {size} byte{'' if size == 1 else 's'} to upload)"
+    )
+
+
+def save(
+    path: str, command: str, url: str, operations: list[Operation]
+) -> None:
+    """Save a plan as JSON"""
+    with open(path, "w") as f:
+        json.dump(
+            {"command": command, "url": url, "operations": operations},
+            f,
+            indent=2,
+        )
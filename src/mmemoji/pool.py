@@ -0,0 +1,54 @@
+"""Bounded concurrent processing of streams of Emojis."""
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def imap_bounded(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = 8,
+    max_pending: int | None = None,
+) -> Iterator[tuple[T, "Future[R]"]]:
+    """Apply a function to a stream of items concurrently.
+
+    Items are consumed lazily, and at most ``max_pending`` of them
+    are in flight at any time, so memory stays bounded
+    whatever the length of the stream.
+
+    Parameters
+    ----------
+    func : callable
+        function to apply to each item
+    items : iterable
+        items to process
+    max_workers : int
+        maximum number of concurrent calls
+    max_pending : int, optional
+        maximum number of submitted items not yet yielded,
+        defaults to twice ``max_workers``
+
+    Yields
+    ------
+    tuple of (item, :obj:`concurrent.futures.Future`)
+        Each item with its completed result, in the order of ``items``
+    """
+    if max_pending is None:
+        max_pending = max_workers * 2
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: deque[tuple[T, Future[R]]] = deque()
+        for item in items:
+            pending.append((item, executor.submit(func, item)))
+            if len(pending) >= max_pending:
+                item, future = pending.popleft()
+                future.exception()
+                yield item, future
+        while pending:
+            item, future = pending.popleft()
+            future.exception()
+            yield item, future
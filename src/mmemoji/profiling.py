@@ -0,0 +1,115 @@
+"""Profiling of commands, to attach real profiles to performance issues.
+
+CPU profiles are written either as :mod:`pstats` files of the main thread,
+or as collapsed stacks sampled from every thread, as expected by
+flame graph tools, e.g. ``flamegraph.pl`` or speedscope.
+Peak memory usage can be reported with :mod:`tracemalloc`.
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import FrameType
+
+import click
+
+from mmemoji.progress import format_size
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler(threading.Thread):
+    """Sample the stacks of all threads at regular intervals"""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        super().__init__(name="mmemoji-profiler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        names = {}
+        while not self._stop_event.wait(self.interval):
+            for thread in threading.enumerate():
+                if thread.ident is not None:
+                    names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                stack = []
+                current: FrameType | None = frame
+                while current is not None:
+                    stack.append(_frame_name(current))
+                    current = current.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def write(self, path: str) -> None:
+        """Write the collapsed stacks, one ``frame;frame count`` per line"""
+        with open(path, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profile(
+    path: str | None, fmt: str = "pstats", memory: bool = False
+) -> Iterator[None]:
+    """Profile the enclosed block
+
+    Parameters
+    ----------
+    path : str, optional
+        file to write the CPU profile to, no CPU profile if ``None``
+    fmt : str
+        ``pstats`` for a :mod:`pstats` file of the main thread,
+        or ``collapsed`` for collapsed stacks sampled from all threads
+    memory : bool
+        report the peak memory allocated by Python on the standard error
+    """
+    if memory:
+        tracemalloc.start()
+    profiler: cProfile.Profile | SamplingProfiler | None = None
+    if path is not None and fmt == "collapsed":
+        profiler = SamplingProfiler()
+        profiler.start()
+    elif path is not None:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if isinstance(profiler, SamplingProfiler):
+            profiler.stop()
+            profiler.write(str(path))
+        elif profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(str(path))
+        if profiler is not None:
+            click.echo(
+                f"Profile of {elapsed:.2f}s written to {path}", err=True
+            )
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            click.echo(
+                f"Peak memory: {format_size(peak)}"
+                f" (at exit: {format_size(current)})",
+                err=True,
+            )
@@ -0,0 +1,193 @@
+"""Progress of bulk commands, with throughput and ETA.
+
+On a terminal, a status line is redrawn in place on the standard error,
+otherwise, e.g. in CI logs, a JSON line is written periodically instead.
+Rates are smoothed with an exponentially weighted moving average,
+and items may finish in any order, from any thread.
+"""
+
+import json
+import sys
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from types import TracebackType
+from typing import IO, Any, TypeVar
+
+import click
+
+if sys.version_info < (3, 11):
+    from typing_extensions import Self
+else:
+    from typing import Self
+
+T = TypeVar("T")
+
+#: Minimum delay in seconds between two rate samples
+SAMPLE_PERIOD = 0.5
+#: Minimum delay in seconds between two redraws on a terminal
+REDRAW_PERIOD = 0.1
+
+
+def format_size(size: float) -> str:
+    """Format a number of bytes for humans (e.g. ``1.2 MB``)"""
+    for unit in ("B", "kB", "MB", "GB"):
+        if abs(size) < 1000 or unit == "GB":
+            break
+        size /= 1000
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as ``[H:]MM:SS``"""
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02}:{seconds:02}"
+    return f"{minutes:02}:{seconds:02}"
+
+
+class Progress:
+    """Report the progress of a bulk command on the standard error."""
+
+    def __init__(
+        self,
+        total: int | None,
+        label: str = "",
+        interval: float = 10.0,
+        smoothing: float = 0.3,
+        file: IO[str] | None = None,
+    ) -> None:
+        """Init Progress class.
+
+        Parameters
+        ----------
+        total : int, optional
+            number of items to process, if known
+        label : str
+            prefix of the status line, and ``label`` of JSON lines
+        interval : float
+            delay in seconds between two JSON lines
+            when not attached to a terminal
+        smoothing : float
+            weight of the latest sample in the smoothed rates, from 0 to 1
+        file : :obj:`file`, optional
+            stream to report to, defaults to the standard error
+        """
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self.smoothing = smoothing
+        self._file = file if file is not None else sys.stderr
+        self._tty = self._file.isatty()
+        self._lock = threading.Lock()
+        self.done = 0
+        self.size = 0
+        self._start = time.monotonic()
+        self._sample = (self._start, 0, 0)
+        self._rates: tuple[float, float] | None = None
+        self._last_report = self._start
+        self._width = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        with self._lock:
+            self._report(final=True)
+
+    def advance(self, items: int = 1, size: int = 0) -> None:
+        """Account for finished items
+
+        Parameters
+        ----------
+        items : int
+            number of items finished
+        size : int
+            number of bytes transferred for these items
+        """
+        with self._lock:
+            self.done += items
+            self.size += size
+            now = time.monotonic()
+            self._update_rates(now)
+            period = REDRAW_PERIOD if self._tty else self.interval
+            if now - self._last_report >= period:
+                self._report()
+
+    def track(self, items: Iterable[T]) -> Iterator[T]:
+        """Iterate over items, each one is finished
+        when the next one is requested
+        """
+        for item in items:
+            yield item
+            self.advance()
+
+    def _update_rates(self, now: float) -> None:
+        sampled_at, done, size = self._sample
+        elapsed = now - sampled_at
+        if elapsed < SAMPLE_PERIOD:
+            return
+        rates = ((self.done - done) / elapsed, (self.size - size) / elapsed)
+        if self._rates is not None:
+            rates = (
+                self.smoothing * rates[0]
+                + (1 - self.smoothing) * self._rates[0],
+                self.smoothing * rates[1]
+                + (1 - self.smoothing) * self._rates[1],
+            )
+        self._rates = rates
+        self._sample = (now, self.done, self.size)
+
+    def status(self) -> dict[str, Any]:
+        """Current progress, as reported in JSON lines"""
+        elapsed = time.monotonic() - self._start
+        if self._rates is not None:
+            items_rate, bytes_rate = self._rates
+        elif elapsed > 0:
+            items_rate, bytes_rate = self.done / elapsed, self.size / elapsed
+        else:
+            items_rate, bytes_rate = 0.0, 0.0
+        eta = None
+        if self.total is not None and items_rate > 0:
+            eta = max(self.total - self.done, 0) / items_rate
+        return {
+            "label": self.label,
+            "done": self.done,
+            "total": self.total,
+            "bytes": self.size,
+            "elapsed": round(elapsed, 2),
+            "items_per_second": round(items_rate, 2),
+            "bytes_per_second": round(bytes_rate, 2),
+            "eta": None if eta is None else round(eta, 2),
+        }
+
+    def _report(self, final: bool = False) -> None:
+        self._last_report = time.monotonic()
+        status = self.status()
+        if not self._tty:
+            click.echo(json.dumps(status), file=self._file)
+            return
+
+        parts = [status["label"]] if status["label"] else []
+        parts.append(
+            f"{status['done']}/{status['total']}"
+            if status["total"] is not None
+            else str(status["done"])
+        )
+        parts.append(f"{status['items_per_second']:.1f} emojis/s")
+        if status["bytes"]:
+            parts.append(f"{format_size(status['bytes_per_second'])}/s")
+        if final:
+            parts.append(f"in {format_duration(status['elapsed'])}")
+        elif status["eta"] is not None:
+            parts.append(f"ETA {format_duration(status['eta'])}")
+        line = "  ".join(parts)
+        padding = " " * max(self._width - len(line), 0)
+        self._width = len(line)
+        click.echo(f"\r{line}{padding}", file=self._file, nl=final)
@@ -0,0 +1,143 @@
+"""Session-wide cache of custom Emoji metadata.
+
+Lookups are cached per driver, so that every :class:`~mmemoji.Emoji`
+instance of a session shares them. Absent Emojis are cached as well
+(negative caching), entries expire after a configurable TTL
+and the number of entries is capped, so memory stays flat
+however large the catalog is.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, ClassVar
+from weakref import WeakKeyDictionary
+
+from mattermostautodriver import TypedDriver as Mattermost
+
+if TYPE_CHECKING:
+    from mmemoji.live import EmojiIndex
+
+
+class MetadataRegistry:
+    """Emoji metadata by name, with expiration."""
+
+    #: Default time-to-live of new registries, in seconds
+    default_ttl: ClassVar[float] = 60.0
+    #: Default maximum number of entries of new registries
+    default_max_size: ClassVar[int] = 10_000
+
+    _registries: ClassVar[WeakKeyDictionary[Mattermost, "MetadataRegistry"]]
+    _registries = WeakKeyDictionary()
+    _registries_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self, ttl: float | None = None, max_size: int | None = None
+    ) -> None:
+        """Init MetadataRegistry class.
+
+        Parameters
+        ----------
+        ttl : float, optional
+            time-to-live of the entries in seconds,
+            defaults to :attr:`default_ttl`
+        max_size : int, optional
+            maximum number of entries, the oldest ones are evicted first,
+            defaults to :attr:`default_max_size`
+        """
+        self.ttl = self.default_ttl if ttl is None else ttl
+        self.max_size = self.default_max_size if max_size is None else max_size
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        #: Live index of the Emojis, see :class:`mmemoji.live.EmojiListener`
+        self.index: EmojiIndex | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def for_driver(cls, mattermost: Mattermost) -> "MetadataRegistry":
+        """Get the registry shared by all Emojis of a driver.
+
+        Parameters
+        ----------
+        mattermost : :obj:`mattermostautodriver.Driver`
+            an instance of `mattermostautodriver`_
+
+        Returns
+        -------
+        :obj:`MetadataRegistry`
+            The registry of the driver, created on first use
+        """
+        with cls._registries_lock:
+            registry = cls._registries.get(mattermost)
+            if registry is None:
+                registry = cls._registries[mattermost] = cls()
+            return registry
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        """Get the cached metadata of an Emoji.
+
+        Parameters
+        ----------
+        name : str
+            Emoji name
+
+        Returns
+        -------
+        :obj:`dict` or None
+            Emoji metadata, an empty :obj:`dict` if the Emoji is known
+            not to exist (e.g. absent from a live index),
+            or ``None`` if it is unknown or expired
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                expires_at, metadata = entry
+                if expires_at > time.monotonic():
+                    return metadata
+                del self._entries[name]
+        index = self.index
+        if index is not None and index.live and name not in index:
+            # The index is complete, the Emoji does not exist
+            return {}
+        return None
+
+    def set(self, name: str, metadata: dict[str, Any]) -> None:
+        """Cache the metadata of an Emoji.
+
+        Parameters
+        ----------
+        name : str
+            Emoji name
+        metadata : :obj:`dict`
+            Emoji metadata, an empty :obj:`dict` if the Emoji does not exist
+        """
+        now = time.monotonic()
+        with self._lock:
+            # Entries are kept in insertion order, which is also the order
+            # they expire in, so expired entries are swept from the front
+            self._entries[name] = (now + self.ttl, metadata)
+            self._entries.move_to_end(name)
+            while self._entries:
+                expires_at, _ = next(iter(self._entries.values()))
+                if expires_at > now and len(self._entries) <= self.max_size:
+                    break
+                self._entries.popitem(last=False)
+
+    def discard(self, name: str) -> None:
+        """Forget about an Emoji.
+
+        Parameters
+        ----------
+        name : str
+            Emoji name
+        """
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def clear(self) -> None:
+        """Forget about all Emojis."""
+        with self._lock:
+            self._entries.clear()
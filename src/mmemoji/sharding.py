@@ -0,0 +1,37 @@
+"""Deterministic partition of Emojis across shards.
+
+Emojis are assigned to shards by a stable hash of their sanitized name,
+so shards never overlap, cover every Emoji together, and the assignment
+does not depend on the machine, the Python version or the input order.
+"""
+
+import hashlib
+
+from mmemoji.emoji import Emoji
+
+#: Shard number, from 1, and count of shards
+Shard = tuple[int, int]
+
+
+def shard_index(name: str, count: int) -> int:
+    """Get the shard of an Emoji, from 0 to ``count - 1``
+
+    Parameters
+    ----------
+    name : str
+        an Emoji name or file path, sanitized before hashing
+    count : int
+        number of shards
+    """
+    digest = hashlib.blake2b(
+        Emoji.sanitize_name(name).encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big") % count
+
+
+def in_shard(name: str, shard: Shard | None) -> bool:
+    """Whether an Emoji belongs to a shard, always if ``shard`` is ``None``"""
+    if shard is None:
+        return True
+    number, count = shard
+    return shard_index(name, count) == number - 1
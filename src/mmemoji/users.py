@@ -0,0 +1,83 @@
+"""Resolve Emoji creator IDs to usernames.
+
+Distinct IDs are looked up in chunks with the users-by-ids endpoint,
+and usernames are cached per driver for the rest of the session.
+"""
+
+import threading
+from collections.abc import Iterable
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from mattermostautodriver import TypedDriver as Mattermost
+
+_usernames: WeakKeyDictionary[Mattermost, dict[str, str]] = WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def get_usernames(
+    mattermost: Mattermost, user_ids: Iterable[str], chunk_size: int = 200
+) -> dict[str, str]:
+    """Get the usernames of many users at once.
+
+    Parameters
+    ----------
+    mattermost : :obj:`mattermostautodriver.Driver`
+        an instance of `mattermostautodriver`_
+    user_ids : :obj:`list` of str
+        user IDs, duplicates are looked up only once
+    chunk_size : int
+        maximum number of IDs per request
+
+    Returns
+    -------
+    :obj:`dict` of (str: str)
+        Usernames by user ID, unknown users (e.g. deleted) are omitted
+    """
+    wanted = {user_id for user_id in user_ids if user_id}
+    with _lock:
+        cache = _usernames.setdefault(mattermost, {})
+        missing = sorted(wanted - cache.keys())
+
+    for i in range(0, len(missing), chunk_size):
+        chunk = missing[i : i + chunk_size]
+        users = mattermost.users.get_users_by_ids(chunk)
+        with _lock:
+            cache.update({user["id"]: user["username"] for user in users})
+
+    with _lock:
+        return {
+            user_id: cache[user_id] for user_id in wanted if user_id in cache
+        }
+
+
+def resolve_creators(
+    mattermost: Mattermost, metadata_list: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Add the username of its creator next to the ID in Emoji metadata.
+
+    Parameters
+    ----------
+    mattermost : :obj:`mattermostautodriver.Driver`
+        an instance of `mattermostautodriver`_
+    metadata_list : :obj:`list` of `dict`
+        Emoji metadata
+
+    Returns
+    -------
+    :obj:`list` of `dict`
+        Emoji metadata with an additional ``creator_username`` key,
+        empty if the user does not exist anymore
+    """
+    usernames = get_usernames(
+        mattermost, [m.get("creator_id", "") for m in metadata_list]
+    )
+    resolved = []
+    for metadata in metadata_list:
+        row: dict[str, Any] = {}
+        for key, value in metadata.items():
+            row[key] = value
+            if key == "creator_id":
+                row["creator_username"] = usernames.get(value, "")
+        resolved.append(row)
+    return resolved
@@ -0,0 +1,230 @@
+"""Watch a directory for new and changed image files.
+
+On Linux, changes are reported by inotify, accessed through :mod:`ctypes`.
+Elsewhere, or when inotify is unavailable, the directory is polled.
+Bursts of changes are debounced, so that a file is only reported
+once it has not been written to for a little while.
+"""
+
+import abc
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Callable
+from types import TracebackType
+
+if sys.version_info < (3, 11):
+    from typing_extensions import Self
+else:
+    from typing import Self
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_EVENT = struct.Struct("iIII")
+
+#: Suffixes of files written by editors and downloads in progress
+TEMPORARY_SUFFIXES = (".tmp", ".part", ".crdownload", ".swp", "~")
+
+
+def is_candidate(name: str) -> bool:
+    """Whether a file name may be an image to upload"""
+    return not name.startswith(".") and not name.endswith(TEMPORARY_SUFFIXES)
+
+
+class Watcher(abc.ABC):
+    """Report names of files changed in a directory"""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    @abc.abstractmethod
+    def poll(self, timeout: float) -> set[str]:
+        """Wait up to ``timeout`` seconds for changes
+
+        Returns
+        -------
+        :obj:`set` of str
+            Names of the files changed since the previous call
+        """
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """Release the resources of the watcher"""
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class InotifyWatcher(Watcher):
+    """Watch a directory with Linux inotify"""
+
+    def __init__(self, directory: str) -> None:
+        super().__init__(directory)
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        # AttributeError on platforms without inotify
+        init = libc.inotify_init1
+        add_watch = libc.inotify_add_watch
+        self._fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        if (
+            add_watch(
+                self._fd,
+                os.fsencode(directory),
+                IN_CLOSE_WRITE | IN_MOVED_TO,
+            )
+            < 0
+        ):
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, os.strerror(errno), directory)
+
+    def poll(self, timeout: float) -> set[str]:
+        names: set[str] = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        while readable:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if not mask & IN_ISDIR:
+                    names.add(os.fsdecode(name))
+        return names
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingWatcher(Watcher):
+    """Watch a directory by comparing snapshots of its files"""
+
+    def __init__(self, directory: str) -> None:
+        super().__init__(directory)
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                stat = _file_stat(entry)
+                if stat is not None:
+                    snapshot[entry.name] = stat
+        return snapshot
+
+    def poll(self, timeout: float) -> set[str]:
+        time.sleep(timeout)
+        snapshot = self._scan()
+        names = {
+            name
+            for name, stat in snapshot.items()
+            if self._snapshot.get(name) != stat
+        }
+        self._snapshot = snapshot
+        return names
+
+    def close(self) -> None:
+        """Nothing to release"""
+
+
+def _file_stat(entry: os.DirEntry[str]) -> tuple[int, int] | None:
+    """Modification time and size of a file, None for other entries"""
+    try:
+        if not entry.is_file():
+            return None
+        stat = entry.stat()
+    except FileNotFoundError:
+        # Removed while scanning
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def open_watcher(directory: str, polling: bool = False) -> Watcher:
+    """Watch a directory with inotify if available, by polling otherwise"""
+    if not polling:
+        try:
+            return InotifyWatcher(directory)
+        except (AttributeError, OSError):
+            pass
+    return PollingWatcher(directory)
+
+
+def watch(
+    directory: str,
+    on_batch: Callable[[list[str]], None],
+    debounce: float = 1.0,
+    interval: float = 1.0,
+    polling: bool = False,
+    timeout: float | None = None,
+) -> None:
+    """Call ``on_batch`` with the paths of files as they settle.
+
+    Parameters
+    ----------
+    directory : str
+        directory to watch
+    on_batch : callable
+        called with the sorted paths of the files changed
+        and left untouched for ``debounce`` seconds
+    debounce : float
+        delay in seconds without changes before a file is reported
+    interval : float
+        delay in seconds between two checks when idle
+    polling : bool
+        poll the directory even if inotify is available
+    timeout : float, optional
+        stop watching after this many seconds, watch forever by default
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    # Last time each file was seen changing
+    pending: dict[str, float] = {}
+    with open_watcher(directory, polling) as watcher:
+        while True:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            wait = debounce if pending else interval
+            if deadline is not None:
+                wait = min(wait, deadline - now)
+            for name in watcher.poll(wait):
+                if is_candidate(name):
+                    pending[name] = time.monotonic()
+
+            now = time.monotonic()
+            settled = sorted(
+                name
+                for name, seen in pending.items()
+                if now - seen >= debounce
+            )
+            for name in settled:
+                del pending[name]
+            paths = [
+                os.path.join(directory, name)
+                for name in settled
+                if os.path.isfile(os.path.join(directory, name))
+            ]
+            if paths:
+                on_batch(paths)
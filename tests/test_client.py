@@ -0,0 +1,82 @@
+import hashlib
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager
+from urllib.parse import urlparse
+
+import pytest
+
+from mmemoji import EmojiClient
+from mmemoji.decorators import EmojiContext
+from mmemoji.exceptions import EmojiAlreadyExists, EmojiNotFound
+
+
+@pytest.mark.usefixtures("class_utils")
+class TestEmojiClient:
+    api_url: str
+    emoji_inventory: Callable[[list[str], str], AbstractContextManager[None]]
+    get_emoji_path: Callable[[str], str]
+    get_emoji_sha256: Callable[[str], str]
+    get_user_username: Callable[[str], str]
+    get_user_password: Callable[[str], str]
+
+    @pytest.fixture
+    def client(self) -> Iterator[EmojiClient]:
+        ctx = EmojiContext()
+        user = "user-1"
+        with ctx.authenticate(
+            url=urlparse(self.api_url),
+            token="",
+            login_id=self.get_user_username(user),
+            password=self.get_user_password(user),
+            mfa_token="",
+            insecure=False,
+        ):
+            yield EmojiClient(ctx.mattermost, max_workers=2)
+
+    def test_create_many(self, client: EmojiClient) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2", "emoji_3"]
+        paths = [self.get_emoji_path(name) for name in emoji_names]
+        # Test
+        with self.emoji_inventory(emoji_names[:1], user):
+            results = client.create_many(paths)
+        assert [r["name"] for r in results] == emoji_names
+        assert isinstance(results[0].get("error"), EmojiAlreadyExists)
+        assert [r["done"] for r in results] == [False, True, True]
+        assert results[1]["metadata"]["name"] == emoji_names[1]
+
+    def test_delete_many(self, client: EmojiClient) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "absent_emoji", "emoji_2"]
+        # Test
+        with self.emoji_inventory(["emoji_1", "emoji_2"], user):
+            results = client.delete_many(emoji_names)
+        assert [r["done"] for r in results] == [True, False, True]
+        assert isinstance(results[1].get("error"), EmojiNotFound)
+
+    def test_download_many(self, client: EmojiClient) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        # Test
+        with self.emoji_inventory(emoji_names, user):
+            results = client.download_many(emoji_names)
+        for name, result in zip(emoji_names, results, strict=True):
+            assert result["done"]
+            assert hashlib.sha256(
+                result.get("image", b"")
+            ).hexdigest() == self.get_emoji_sha256(name)
+
+    def test_resolve_with_listing(self, client: EmojiClient) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        client.lookup_threshold = 0
+        # Test
+        with self.emoji_inventory(emoji_names, user):
+            resolved = client.resolve([*emoji_names, "absent_emoji"])
+        assert resolved["emoji_1"]["name"] == "emoji_1"
+        assert resolved["emoji_2"]["name"] == "emoji_2"
+        assert resolved["absent_emoji"] == {}
@@ -0,0 +1,112 @@
+import json
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Any
+from unittest.mock import _patch_dict
+
+import pytest
+from click.testing import CliRunner
+
+from mmemoji.cli import cli
+
+
+@pytest.mark.usefixtures("class_utils")
+class TestApply:
+    cli_runner: CliRunner
+    emoji_inventory: Callable[[list[str], str], AbstractContextManager[None]]
+    find_dict_in_list: Callable[
+        [list[dict[str, Any]], str, Any], dict[str, Any] | None
+    ]
+    get_emoji_path: Callable[[str], str]
+    user_env: Callable[[str], _patch_dict]
+
+    def test_help(self) -> None:
+        result = self.cli_runner.invoke(cli, ["apply", "--help"])
+        assert result.exit_code == 0
+
+    def test_apply_create_plan(self, tmp_path: Path) -> None:
+        # Setup
+        # 1st will not exist and will be created
+        # 2nd will exist and will be overwritten
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        emoji_paths = [self.get_emoji_path(name) for name in emoji_names]
+        plan = tmp_path / "plan.json"
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names[1:], user):
+            self.cli_runner.invoke(
+                cli,
+                ["create", "--force", "--save-plan", str(plan), *emoji_paths],
+            )
+            result = self.cli_runner.invoke(
+                cli, ["apply", str(plan), "-o", "json"]
+            )
+            result_list = self.cli_runner.invoke(cli, ["list", "-o", "json"])
+        assert result.exit_code == 0
+        rows = json.loads(result.stdout)
+        assert [r["result"] for r in rows] == ["applied", "applied"]
+        emoji_list = json.loads(result_list.stdout)
+        assert sorted(e["name"] for e in emoji_list) == emoji_names
+
+    def test_apply_stale_plan(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        emoji_name = "emoji_1"
+        plan = tmp_path / "plan.json"
+        # Test
+        with self.user_env(user):
+            with self.emoji_inventory([], user):
+                self.cli_runner.invoke(
+                    cli,
+                    [
+                        "create",
+                        "--save-plan",
+                        str(plan),
+                        self.get_emoji_path(emoji_name),
+                    ],
+                )
+            with self.emoji_inventory([emoji_name], user):
+                result = self.cli_runner.invoke(
+                    cli, ["apply", str(plan), "-o", "json"]
+                )
+        assert result.exit_code == 1
+        rows = json.loads(result.stdout)
+        error = result.stderr.split("\n")[-2]
+        assert rows[0]["result"] == (
+            "conflict: emoji was created since the plan"
+        )
+        assert error == "Error: 1 operation not applied"
+
+    def test_apply_plan_missing_image(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        emoji_name = "emoji_1"
+        image = tmp_path / "emoji_1.png"
+        image.write_bytes(Path(self.get_emoji_path(emoji_name)).read_bytes())
+        plan = tmp_path / "plan.json"
+        # Test
+        with self.user_env(user), self.emoji_inventory([], user):
+            self.cli_runner.invoke(
+                cli, ["create", "--save-plan", str(plan), str(image)]
+            )
+            image.unlink()
+            result = self.cli_runner.invoke(
+                cli, ["apply", str(plan), "-o", "json"]
+            )
+        assert result.exit_code == 1
+        rows = json.loads(result.stdout)
+        assert rows[0]["result"].startswith("error: ")
+        assert str(image) in rows[0]["result"]
+
+    def test_apply_invalid_operation(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        plan = tmp_path / "plan.json"
+        plan.write_text(json.dumps({"operations": [{"action": "delete"}]}))
+        # Test
+        with self.user_env(user):
+            result = self.cli_runner.invoke(cli, ["apply", str(plan)])
+        assert result.exit_code == 1
+        error = result.stderr.split("\n")[-2]
+        assert error == f"Error: {plan}: Invalid operation #1"
@@ -0,0 +1,134 @@
+import json
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from pathlib import Path
+from unittest.mock import _patch_dict
+
+import pytest
+from click.testing import CliRunner
+
+from mmemoji.cli import cli
+
+
+@pytest.mark.usefixtures("class_utils")
+class TestCopy:
+    api_url: str
+    cli_runner: CliRunner
+    emoji_inventory: Callable[[list[str], str], AbstractContextManager[None]]
+    get_user_password: Callable[[str], str]
+    get_user_username: Callable[[str], str]
+    user_env: Callable[[str], _patch_dict]
+
+    def test_help(self) -> None:
+        result = self.cli_runner.invoke(cli, ["copy", "--help"])
+        assert result.exit_code == 0
+
+    def test_copy_emoji_force(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        config = tmp_path / "config.ini"
+        config.write_text(
+            "[source]\n"
+            f"url = {self.api_url}\n"
+            f"login_id = {self.get_user_username(user)}\n"
+            f"password = {self.get_user_password(user)}\n"
+        )
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli,
+                [
+                    "copy",
+                    "--config",
+                    str(config),
+                    "--from",
+                    "source",
+                    "--to",
+                    self.api_url,
+                    "--match",
+                    "*_1",
+                    "--force",
+                    "-o",
+                    "json",
+                ],
+            )
+            result_list = self.cli_runner.invoke(cli, ["list", "-o", "json"])
+        assert result.exit_code == 0
+        emoji_list = json.loads(result.stdout)
+        assert [e["name"] for e in emoji_list] == ["emoji_1"]
+        emoji_list = json.loads(result_list.stdout)
+        assert sorted(e["name"] for e in emoji_list) == emoji_names
+
+    def test_copy_emoji_no_clobber(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli,
+                [
+                    "copy",
+                    "--from",
+                    self.api_url,
+                    "--to",
+                    self.api_url,
+                    "--no-clobber",
+                    "-o",
+                    "json",
+                ],
+            )
+        assert result.exit_code == 0
+        assert result.stdout == ""
+
+    def test_copy_existing_emoji(self) -> None:
+        # Setup
+        user = "user-1"
+        # Test
+        with self.user_env(user), self.emoji_inventory(["emoji_1"], user):
+            result = self.cli_runner.invoke(
+                cli,
+                ["copy", "--from", self.api_url, "--to", self.api_url],
+            )
+        assert result.exit_code == 1
+        error = result.stderr.split("\n")[-2]
+        assert error == 'Error: Emoji "emoji_1" exists'
+
+    def test_copy_unknown_server(self, tmp_path: Path) -> None:
+        config = tmp_path / "config.ini"
+        config.write_text(f"[source]\nurl = {self.api_url}\n")
+        result = self.cli_runner.invoke(
+            cli,
+            [
+                "copy",
+                "--config",
+                str(config),
+                "--from",
+                "source",
+                "--to",
+                "unknown",
+            ],
+        )
+        assert result.exit_code == 1
+        assert result.stderr == f'Error: {config}: Unknown server "unknown"\n'
+
+    def test_copy_different_urls(self) -> None:
+        # The credentials of a server must not be sent to the other one
+        result = self.cli_runner.invoke(
+            cli,
+            [
+                "copy",
+                "--from",
+                self.api_url,
+                "--to",
+                "https://other",
+                "-t",
+                "x",
+            ],
+        )
+        assert result.exit_code == 2
+        assert result.stderr.splitlines()[-1] == (
+            "Error: --from and --to are URLs of different servers,"
+            " describe one of them in the configuration file"
+        )
@@ -1,6 +1,8 @@
 import json
+import shutil
 from collections.abc import Callable
 from contextlib import AbstractContextManager
+from pathlib import Path
 from typing import Any
 from unittest.mock import _patch_dict
 
@@ -8,6 +10,7 @@ import pytest
 from click.testing import CliRunner
 
 from mmemoji.cli import cli
+from mmemoji.commands.create import find_images
 
 
 @pytest.mark.usefixtures("class_utils")
@@ -134,7 +137,7 @@ class TestCreate:
                 cli, ["create", "--no-clobber", emoji_path, "-o", "json"]
             )
         assert result.exit_code == 0
-        assert result.stdout == "\n"
+        assert result.stdout == ""
 
     def test_create_no_clobber_exiting_system_emoji(self) -> None:
         # Setup
@@ -147,7 +150,7 @@ class TestCreate:
                 cli, ["create", "--no-clobber", emoji_path, "-o", "json"]
             )
         assert result.exit_code == 0
-        assert result.stdout == "\n"
+        assert result.stdout == ""
 
     def test_interactive_create_emoji(self) -> None:
         # Setup
@@ -173,3 +176,136 @@ class TestCreate:
         assert emoji1["name"] == emoji_names[0]
         assert emoji2 is not None
         assert emoji2["name"] == emoji_names[1]
+
+    def test_dry_run_create_emoji(self, tmp_path: Path) -> None:
+        # Setup
+        # 1st will not exist and would be created
+        # 2nd will exist and would be overwritten
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        emoji_paths = [self.get_emoji_path(name) for name in emoji_names]
+        plan = tmp_path / "plan.json"
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names[1:], user):
+            result = self.cli_runner.invoke(
+                cli,
+                [
+                    "create",
+                    "--force",
+                    "--save-plan",
+                    str(plan),
+                    "-o",
+                    "json",
+                    *emoji_paths,
+                ],
+            )
+            result_list = self.cli_runner.invoke(cli, ["list", "-o", "json"])
+        assert result.exit_code == 0
+        operations = json.loads(result.stdout)
+        assert [o["action"] for o in operations] == ["create", "overwrite"]
+        assert "id" in operations[1]
+        assert "Plan: 1 create, 1 overwrite (3 requests," in result.stderr
+        assert json.loads(plan.read_text())["operations"] == operations
+        emoji_list = json.loads(result_list.stdout)
+        assert [e["name"] for e in emoji_list] == emoji_names[1:]
+
+    def test_interactive_create_emoji_with_answers(
+        self, tmp_path: Path
+    ) -> None:
+        # Setup
+        # 1st will not exist and will be created
+        # 2nd will exist and will be overwritten as answered
+        # 3rd will exist and will not be overwritten as answered
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2", "emoji_3"]
+        emoji_paths = [self.get_emoji_path(name) for name in emoji_names]
+        answers = tmp_path / "answers.json"
+        answers.write_text(json.dumps({"emoji_2": True, "emoji_3": False}))
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names[1:], user):
+            result = self.cli_runner.invoke(
+                cli,
+                [
+                    "create",
+                    "--interactive",
+                    "--answers",
+                    str(answers),
+                    "-o",
+                    "json",
+                    *emoji_paths,
+                ],
+            )
+        assert result.exit_code == 0
+        assert "overwrite" not in result.stderr
+        emoji_list = json.loads(result.stdout)
+        assert [e["name"] for e in emoji_list] == emoji_names[:2]
+
+    def test_create_emoji_from_stdin(self) -> None:
+        # Setup
+        user = "user-1"
+        # Test
+        with self.user_env(user):
+            result = self.cli_runner.invoke(
+                cli, ["create", "-"], input=b"not an image"
+            )
+        assert result.exit_code == 2
+        assert "cannot be read from the standard input" in result.stderr
+
+    def test_create_emoji_directory(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        (tmp_path / "sub").mkdir()
+        (tmp_path / ".hidden").mkdir()
+        for name, directory in [
+            ("emoji_1", tmp_path),
+            ("emoji_2", tmp_path),
+            ("emoji_3", tmp_path / "sub"),
+            ("100", tmp_path / ".hidden"),
+        ]:
+            shutil.copy(self.get_emoji_path(name), directory)
+        (tmp_path / "README.txt").write_text("not an emoji")
+        # Links to directories are not walked
+        (tmp_path / "sub" / "parent").symlink_to(tmp_path)
+        # Test
+        with self.user_env(user), self.emoji_inventory([], user):
+            result = self.cli_runner.invoke(
+                cli,
+                [
+                    "create",
+                    str(tmp_path),
+                    "--recursive",
+                    "--include",
+                    "*.png",
+                    "--exclude",
+                    "emoji_2.*",
+                    "-o",
+                    "json",
+                ],
+            )
+            result_flat = self.cli_runner.invoke(
+                cli,
+                [
+                    "create",
+                    str(tmp_path),
+                    "--include",
+                    "*.png",
+                    "-n",
+                    "-o",
+                    "json",
+                ],
+            )
+        assert result.exit_code == 0
+        emoji_list = json.loads(result.stdout)
+        assert sorted(e["name"] for e in emoji_list) == ["emoji_1", "emoji_3"]
+        # Subdirectories are only walked with --recursive
+        assert result_flat.exit_code == 0
+        emoji_list = json.loads(result_flat.stdout)
+        assert [e["name"] for e in emoji_list] == ["emoji_2"]
+
+    def test_find_images_symlink_loop(self, tmp_path: Path) -> None:
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "a.png").write_bytes(b"")
+        (tmp_path / "sub" / "parent").symlink_to(tmp_path)
+        assert list(find_images([str(tmp_path)], recursive=True)) == [
+            str(tmp_path / "sub" / "a.png")
+        ]
@@ -0,0 +1,75 @@
+import json
+import shutil
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from pathlib import Path
+from unittest.mock import _patch_dict
+
+import pytest
+from click.testing import CliRunner
+
+from mmemoji.cli import cli
+from mmemoji.commands.dedupe import DuplicateIndex
+
+
+@pytest.mark.usefixtures("class_utils")
+class TestDedupe:
+    cli_runner: CliRunner
+    emoji_inventory: Callable[[list[str], str], AbstractContextManager[None]]
+    get_emoji_path: Callable[[str], str]
+    user_env: Callable[[str], _patch_dict]
+
+    def test_help(self) -> None:
+        result = self.cli_runner.invoke(cli, ["dedupe", "--help"])
+        assert result.exit_code == 0
+
+    def test_dedupe_emoji(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        copy = tmp_path / "emoji_copy.png"
+        shutil.copy(self.get_emoji_path("emoji_1"), copy)
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            self.cli_runner.invoke(cli, ["create", str(copy)])
+            result = self.cli_runner.invoke(
+                cli, ["dedupe", "--delete", "-o", "json"]
+            )
+            result_list = self.cli_runner.invoke(cli, ["list", "-o", "json"])
+        assert result.exit_code == 0
+        rows = json.loads(result.stdout)
+        assert [(r["name"], r["deleted"]) for r in rows] == [
+            ("emoji_1", False),
+            ("emoji_copy", True),
+        ]
+        emoji_list = json.loads(result_list.stdout)
+        assert sorted(e["name"] for e in emoji_list) == emoji_names
+
+    def test_dedupe_no_duplicates(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(cli, ["dedupe", "-o", "json"])
+        assert result.exit_code == 0
+        assert result.stdout == ""
+
+    @pytest.mark.parametrize("distance", [1, 4, 64])
+    def test_duplicate_index_distance(self, distance: int) -> None:
+        index = DuplicateIndex(distance)
+        hashes = {
+            "a": 0xFFFF_0000_FFFF_0000,
+            # Close to a, in bits of different bands
+            "b": 0xFFFF_0000_FFFF_0000 ^ (1 << 63 | 1),
+            "c": 0x0000_FFFF_0000_FFFF,
+        }
+        for create_at, (name, key) in enumerate(hashes.items()):
+            index.add(key, {"name": name, "create_at": create_at})
+        groups = [[m["name"] for m in g] for g in index.duplicates()]
+        if distance == 1:
+            assert groups == []
+        elif distance == 4:
+            assert groups == [["a", "b"]]
+        else:
+            assert groups == [["a", "b", "c"]]
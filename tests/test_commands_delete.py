@@ -1,6 +1,7 @@
 import json
 from collections.abc import Callable
 from contextlib import AbstractContextManager
+from pathlib import Path
 from typing import Any
 from unittest.mock import _patch_dict
 
@@ -50,7 +51,7 @@ class TestDelete:
                 cli, ["delete", emoji_name, "-o", "json"]
             )
         assert result.exit_code == 1
-        assert result.stdout == "\n"
+        assert result.stdout == ""
         error = result.stderr.split("\n")[-2]
         assert error == f'Error: Emoji "{emoji_name}" does not exist'
 
@@ -80,7 +81,7 @@ class TestDelete:
                 cli, ["delete", "--force", emoji_name, "-o", "json"]
             )
         assert result.exit_code == 0
-        assert result.stdout == "\n"
+        assert result.stdout == ""
 
     def test_interactive_delete_emoji(self) -> None:
         # Setup
@@ -102,3 +103,143 @@ class TestDelete:
         emoji1 = self.find_dict_in_list(emoji_list, "name", emoji_names[0])
         assert emoji1 is not None
         assert emoji1["name"] == emoji_names[0]
+
+    def test_delete_emoji_with_journal(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        journal = tmp_path / "journal"
+        journal.write_text(json.dumps({"scope": "delete", "item": "emoji_1"}))
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli,
+                [
+                    "delete",
+                    "--journal",
+                    str(journal),
+                    "-o",
+                    "json",
+                    *emoji_names,
+                ],
+            )
+        assert result.exit_code == 0
+        emoji_list = json.loads(result.stdout)
+        assert [e["name"] for e in emoji_list] == ["emoji_2"]
+        assert "emoji_2" in journal.read_text()
+
+    def test_dry_run_delete_emoji(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "absent_emoji"]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names[:1], user):
+            result = self.cli_runner.invoke(
+                cli, ["delete", "--dry-run", "-o", "json", *emoji_names]
+            )
+            result_list = self.cli_runner.invoke(cli, ["list", "-o", "json"])
+        assert result.exit_code == 0
+        operations = json.loads(result.stdout)
+        assert [o["action"] for o in operations] == ["delete", "missing"]
+        assert "Plan: 1 delete, 1 missing (1 request, 0 bytes" in result.stderr
+        assert len(json.loads(result_list.stdout)) == 1
+
+    def test_delete_emoji_keep_going(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["absent_emoji", "emoji_1"]
+        failures = tmp_path / "failures.jsonl"
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names[1:], user):
+            result = self.cli_runner.invoke(
+                cli,
+                [
+                    "delete",
+                    "--keep-going",
+                    "--failures",
+                    str(failures),
+                    "-o",
+                    "json",
+                    *emoji_names,
+                ],
+            )
+            result_retry = self.cli_runner.invoke(
+                cli,
+                ["delete", "--force", "--retry", str(failures), "-o", "json"],
+            )
+        assert result.exit_code == 1
+        emoji_list = json.loads(result.stdout)
+        assert [e["name"] for e in emoji_list] == ["emoji_1"]
+        assert 'absent_emoji: Emoji "absent_emoji" does not exist' in (
+            result.stderr
+        )
+        failure = json.loads(failures.read_text())
+        assert failure["item"] == "absent_emoji"
+        assert failure["exception"] == "EmojiNotFound"
+        assert failure["status"] == 404
+        assert result_retry.exit_code == 0
+        assert result_retry.stdout == ""
+
+    def test_delete_emoji_stdin(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2", "emoji_3"]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result_list = self.cli_runner.invoke(cli, ["list", "-o", "ndjson"])
+            # Metadata lines and plain names can be mixed
+            lines = [
+                line
+                for line in result_list.stdout.splitlines()
+                if '"emoji_3"' not in line
+            ]
+            result = self.cli_runner.invoke(
+                cli,
+                ["delete", "-", "-o", "ndjson"],
+                input="\n".join([*lines, "emoji_3", ""]),
+            )
+            result_after = self.cli_runner.invoke(cli, ["list", "-o", "json"])
+        assert result.exit_code == 0
+        emoji_list = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [e["name"] for e in emoji_list] == emoji_names
+        assert result_after.stdout == ""
+
+    def test_delete_emoji_shards(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = [
+            "100",
+            "accentue",
+            "emoji_1",
+            "emoji_2",
+            "emoji_3",
+            "parentheses_spaced",
+        ]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            results = [
+                self.cli_runner.invoke(
+                    cli,
+                    ["delete", *emoji_names, "--shard", shard, "-o", "json"],
+                )
+                for shard in ("1/2", "2/2")
+            ]
+        assert all(result.exit_code == 0 for result in results)
+        deleted = [
+            emoji["name"]
+            for result in results
+            for emoji in json.loads(result.stdout or "[]")
+        ]
+        assert sorted(deleted) == emoji_names
+
+    def test_delete_emoji_invalid_stdin(self) -> None:
+        # Setup
+        user = "user-1"
+        # Test
+        with self.user_env(user), self.emoji_inventory([], user):
+            result = self.cli_runner.invoke(
+                cli, ["delete", "-"], input='{"name": \n'
+            )
+        assert result.exit_code == 1
+        error = result.stderr.split("\n")[-2]
+        assert error == "Error: -:1: Invalid emoji metadata"
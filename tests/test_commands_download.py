@@ -1,4 +1,5 @@
 import hashlib
+import json
 import os
 from collections.abc import Callable
 from contextlib import AbstractContextManager
@@ -68,6 +69,30 @@ class TestDownload:
             with (destination / emoji_filenames[i]).open("rb") as f:
                 assert hashlib.sha256(f.read()).hexdigest() == emoji_sha256s[i]
 
+    def test_download_emojis_metrics(self, tmp_path: Path) -> None:
+        # Setup
+        emoji_names = ["emoji_1", "emoji_2"]
+        metrics = tmp_path / "mmemoji.prom"
+        user = "user-1"
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli,
+                [
+                    "download",
+                    *emoji_names,
+                    str(tmp_path),
+                    "--metrics-file",
+                    str(metrics),
+                ],
+            )
+        assert result.exit_code == 0
+        lines = metrics.read_text().splitlines()
+        assert (
+            'mmemoji_items_total{command="download",outcome="succeeded"} 2'
+            in lines
+        )
+
     def test_download_emoji_to_full_path(self, tmp_path: Path) -> None:
         # Setup
         destination = tmp_path / "my_emoji.img"
@@ -195,3 +220,72 @@ class TestDownload:
             assert os.path.basename(path) == emoji_filenames[i]
             with (destination / emoji_filenames[i]).open("rb") as f:
                 assert hashlib.sha256(f.read()).hexdigest() == emoji_sha256s[i]
+
+    def test_mirror_download(self, tmp_path: Path) -> None:
+        # Setup
+        destination = tmp_path
+        emoji_names = ["emoji_1", "emoji_2"]
+        user = "user-1"
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result_first = self.cli_runner.invoke(
+                cli, ["download", "--mirror", str(destination), "-o", "json"]
+            )
+            result_second = self.cli_runner.invoke(
+                cli, ["download", "--mirror", str(destination), "-o", "json"]
+            )
+            with self.emoji_inventory(emoji_names[:1], user):
+                result_third = self.cli_runner.invoke(
+                    cli,
+                    ["download", "--mirror", str(destination), "-o", "json"],
+                )
+        assert result_first.exit_code == 0
+        changes = json.loads(result_first.stdout)
+        assert sorted(c["name"] for c in changes) == emoji_names
+        assert all(c["action"] == "added" for c in changes)
+        assert result_second.exit_code == 0
+        assert result_second.stdout == ""
+        assert result_third.exit_code == 0
+        changes = json.loads(result_third.stdout)
+        assert changes == [
+            {"name": "emoji_2", "action": "removed", "file": "emoji_2.png"}
+        ]
+        assert os.path.exists(destination / "emoji_1.png")
+        assert not os.path.exists(destination / "emoji_2.png")
+        with (destination / "emoji_1.png").open("rb") as f:
+            assert hashlib.sha256(f.read()).hexdigest() == (
+                self.get_emoji_sha256("emoji_1")
+            )
+
+    def test_mirror_download_with_names(self, tmp_path: Path) -> None:
+        with self.user_env("user-1"):
+            result = self.cli_runner.invoke(
+                cli, ["download", "--mirror", "emoji_1", str(tmp_path)]
+            )
+        assert result.exit_code == 2
+
+    def test_download_emojis_from_file(self, tmp_path: Path) -> None:
+        # Setup
+        destination = tmp_path / "emojis"
+        destination.mkdir()
+        names = tmp_path / "names.txt"
+        names.write_text("emoji_1\n\nemoji_2\n")
+        emoji_names = ["emoji_1", "emoji_2"]
+        user = "user-1"
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli,
+                ["download", "--from-file", str(names), str(destination)],
+            )
+        assert result.exit_code == 0
+        paths = result.stdout.strip().split("\n")
+        assert [os.path.basename(path) for path in paths] == [
+            "emoji_1.png",
+            "emoji_2.png",
+        ]
+        for name in emoji_names:
+            with (destination / f"{name}.png").open("rb") as f:
+                assert hashlib.sha256(f.read()).hexdigest() == (
+                    self.get_emoji_sha256(name)
+                )
@@ -1,6 +1,7 @@
 import json
 from collections.abc import Callable
 from contextlib import AbstractContextManager
+from pathlib import Path
 from typing import Any
 from unittest.mock import _patch_dict
 
@@ -12,11 +13,14 @@ from mmemoji.cli import cli
 
 @pytest.mark.usefixtures("class_utils")
 class TestList:
+    api_url: str
     cli_runner: CliRunner
     emoji_inventory: Callable[[list[str], str], AbstractContextManager[None]]
     find_dict_in_list: Callable[
         [list[dict[str, Any]], str, Any], dict[str, Any] | None
     ]
+    get_user_username: Callable[[str], str]
+    get_user_password: Callable[[str], str]
     user_env: Callable[[str], _patch_dict]
 
     def test_help(self) -> None:
@@ -42,3 +46,141 @@ class TestList:
         assert emoji2["name"] == emoji_names[1]
         assert emoji3 is not None
         assert emoji3["name"] == emoji_names[2]
+
+    def test_list_emoji_since(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result_all = self.cli_runner.invoke(
+                cli, ["list", "--since", "1h", "-o", "json"]
+            )
+            result_none = self.cli_runner.invoke(
+                cli, ["list", "--since", "2999-01-01", "-o", "json"]
+            )
+        assert result_all.exit_code == 0
+        assert len(json.loads(result_all.stdout)) == len(emoji_names)
+        assert result_none.exit_code == 0
+        assert result_none.stdout == ""
+
+    def test_list_emoji_since_invalid(self) -> None:
+        result = self.cli_runner.invoke(
+            cli, ["list", "--since", "yesterday", "-u", "http://localhost"]
+        )
+        assert result.exit_code == 2
+
+    def test_list_emoji_state(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        state = tmp_path / "state"
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result_first = self.cli_runner.invoke(
+                cli, ["list", "--state", str(state), "-o", "json"]
+            )
+            result_second = self.cli_runner.invoke(
+                cli, ["list", "--state", str(state), "-o", "json"]
+            )
+        assert result_first.exit_code == 0
+        assert len(json.loads(result_first.stdout)) == len(emoji_names)
+        assert int(state.read_text()) > 0
+        assert result_second.exit_code == 0
+        assert result_second.stdout == ""
+
+    def test_list_emoji_servers(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        servers = ["primary", "secondary"]
+        config = tmp_path / "config.ini"
+        config.write_text(
+            "".join(
+                f"[{server}]\n"
+                f"url = {self.api_url}\n"
+                f"login_id = {self.get_user_username(user)}\n"
+                f"password = {self.get_user_password(user)}\n"
+                for server in servers
+            )
+        )
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli,
+                [
+                    "list",
+                    "--config",
+                    str(config),
+                    "--servers",
+                    ",".join(servers),
+                    "-o",
+                    "json",
+                ],
+            )
+        assert result.exit_code == 0
+        emoji_list = json.loads(result.stdout)
+        assert len(emoji_list) == len(servers) * len(emoji_names)
+        for server in servers:
+            rows = [e for e in emoji_list if e["server"] == server]
+            assert sorted(e["name"] for e in rows) == emoji_names
+
+    def test_list_emoji_unknown_server(self, tmp_path: Path) -> None:
+        config = tmp_path / "config.ini"
+        config.write_text(f"[primary]\nurl = {self.api_url}\n")
+        result = self.cli_runner.invoke(
+            cli, ["list", "--config", str(config), "--servers", "unknown"]
+        )
+        assert result.exit_code == 1
+        assert result.stderr == f'Error: {config}: Unknown server "unknown"\n'
+
+    def test_list_emoji_servers_state(self, tmp_path: Path) -> None:
+        # The servers would race on the high-water mark
+        result = self.cli_runner.invoke(
+            cli,
+            ["list", "--servers", "a,b", "--state", str(tmp_path / "state")],
+        )
+        assert result.exit_code == 2
+        assert result.stderr.splitlines()[-1] == (
+            "Error: --state cannot be used with --servers"
+        )
+
+    def test_list_emoji_resolve_users(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli, ["list", "--resolve-users", "-o", "json"]
+            )
+        assert result.exit_code == 0
+        emoji_list = json.loads(result.stdout)
+        assert len(emoji_list) == len(emoji_names)
+        for emoji in emoji_list:
+            assert emoji["creator_username"] == self.get_user_username(user)
+
+    def test_list_emoji_metrics(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        metrics = tmp_path / "mmemoji.prom"
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli, ["list", "--metrics-file", str(metrics), "-o", "json"]
+            )
+        assert result.exit_code == 0
+        lines = metrics.read_text().splitlines()
+        # Listed emojis are not processed items
+        assert not any(
+            line.startswith("mmemoji_items_total{") for line in lines
+        )
+        assert 'mmemoji_run_success{command="list"} 1' in lines
+        assert any(
+            line.startswith(
+                'mmemoji_requests_total{command="list",method="GET",'
+                'endpoint="/api/v4/emoji",status="200"}'
+            )
+            for line in lines
+        )
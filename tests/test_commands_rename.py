@@ -0,0 +1,120 @@
+import json
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from pathlib import Path
+from unittest.mock import _patch_dict
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from mmemoji.cli import cli
+from mmemoji.commands.rename import order_pairs
+
+
+@pytest.mark.usefixtures("class_utils")
+class TestRename:
+    cli_runner: CliRunner
+    emoji_inventory: Callable[[list[str], str], AbstractContextManager[None]]
+    user_env: Callable[[str], _patch_dict]
+
+    def test_help(self) -> None:
+        result = self.cli_runner.invoke(cli, ["rename", "--help"])
+        assert result.exit_code == 0
+
+    def test_rename_emoji(self) -> None:
+        # Setup
+        user = "user-1"
+        # Test
+        with self.user_env(user), self.emoji_inventory(["emoji_1"], user):
+            result = self.cli_runner.invoke(
+                cli, ["rename", "emoji_1", "renamed_emoji", "-o", "json"]
+            )
+            result_list = self.cli_runner.invoke(cli, ["list", "-o", "json"])
+        assert result.exit_code == 0
+        emoji_list = json.loads(result.stdout)
+        assert [e["name"] for e in emoji_list] == ["renamed_emoji"]
+        emoji_list = json.loads(result_list.stdout)
+        assert [e["name"] for e in emoji_list] == ["renamed_emoji"]
+
+    def test_rename_mapping(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        mapping = tmp_path / "mapping.txt"
+        mapping.write_text(
+            "# old new\nemoji_1 renamed_1\n\nemoji_2, renamed_2\n"
+        )
+        # Test
+        with (
+            self.user_env(user),
+            self.emoji_inventory(["emoji_1", "emoji_2"], user),
+        ):
+            result = self.cli_runner.invoke(
+                cli, ["rename", "--mapping", str(mapping), "-o", "json"]
+            )
+            result_list = self.cli_runner.invoke(cli, ["list", "-o", "json"])
+        assert result.exit_code == 0
+        emoji_list = json.loads(result_list.stdout)
+        assert sorted(e["name"] for e in emoji_list) == [
+            "renamed_1",
+            "renamed_2",
+        ]
+
+    def test_rename_existing_emoji(self) -> None:
+        # Setup
+        user = "user-1"
+        # Test
+        with (
+            self.user_env(user),
+            self.emoji_inventory(["emoji_1", "emoji_2"], user),
+        ):
+            result = self.cli_runner.invoke(
+                cli, ["rename", "emoji_1", "emoji_2", "-o", "json"]
+            )
+            result_list = self.cli_runner.invoke(cli, ["list", "-o", "json"])
+        assert result.exit_code == 1
+        error = result.stderr.split("\n")[-2]
+        assert error == 'Error: emoji_1 -> emoji_2: Emoji "emoji_2" exists'
+        emoji_list = json.loads(result_list.stdout)
+        assert sorted(e["name"] for e in emoji_list) == ["emoji_1", "emoji_2"]
+
+    def test_rename_absent_emoji(self) -> None:
+        # Setup
+        user = "user-1"
+        # Test
+        with self.user_env(user), self.emoji_inventory([], user):
+            result = self.cli_runner.invoke(
+                cli, ["rename", "absent_emoji", "new_emoji", "-o", "json"]
+            )
+        assert result.exit_code == 1
+        error = result.stderr.split("\n")[-2]
+        assert error == (
+            "Error: absent_emoji -> new_emoji:"
+            ' Emoji "absent_emoji" does not exist'
+        )
+
+    def test_rename_missing_names(self) -> None:
+        result = self.cli_runner.invoke(cli, ["rename", "emoji_1"])
+        assert result.exit_code == 2
+
+    def test_order_pairs(self) -> None:
+        pairs = [("a", "b"), ("b", "c"), ("c", "d"), ("e", "f")]
+        assert order_pairs(pairs) == [
+            [("c", "d"), ("e", "f")],
+            [("b", "c")],
+            [("a", "b")],
+        ]
+
+    @pytest.mark.parametrize(
+        ("pairs", "message"),
+        [
+            ([("a", "b"), ("b", "a")], "Circular renames: a -> b, b -> a"),
+            ([("a", "b"), ("a", "c")], "Duplicate old names: a"),
+            ([("a", "c"), ("b", "c")], "Duplicate new names: c"),
+        ],
+    )
+    def test_order_pairs_invalid(
+        self, pairs: list[tuple[str, str]], message: str
+    ) -> None:
+        with pytest.raises(click.ClickException, match=f"^{message}$"):
+            order_pairs(pairs)
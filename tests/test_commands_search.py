@@ -17,6 +17,7 @@ class TestSearch:
     find_dict_in_list: Callable[
         [list[dict[str, Any]], str, Any], dict[str, Any] | None
     ]
+    get_user_username: Callable[[str], str]
     user_env: Callable[[str], _patch_dict]
 
     def test_help(self) -> None:
@@ -66,3 +67,18 @@ class TestSearch:
             )
         assert result.exit_code == 0
         assert result.stdout == ""
+
+    def test_search_emoji_resolve_users(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli, ["search", "-U", "-o", "json", "emoji"]
+            )
+        assert result.exit_code == 0
+        emoji_list = json.loads(result.stdout)
+        assert len(emoji_list) == len(emoji_names)
+        for emoji in emoji_list:
+            assert emoji["creator_username"] == self.get_user_username(user)
@@ -0,0 +1,127 @@
+import json
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Any
+from unittest.mock import _patch_dict
+
+import pytest
+from click.testing import CliRunner
+
+from mmemoji.cli import cli
+
+
+@pytest.mark.usefixtures("class_utils")
+class TestServe:
+    api_url: str
+    cli_runner: CliRunner
+    emoji_inventory: Callable[[list[str], str], AbstractContextManager[None]]
+    find_dict_in_list: Callable[
+        [list[dict[str, Any]], str, Any], dict[str, Any] | None
+    ]
+    user_env: Callable[[str], _patch_dict]
+
+    def test_help(self) -> None:
+        result = self.cli_runner.invoke(cli, ["serve", "--help"])
+        assert result.exit_code == 0
+
+    def test_serve_commands(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        requests = [
+            {"id": 1, "command": "list", "args": ["-o", "json"]},
+            {"id": 2, "command": "delete", "args": ["emoji_1", "-o", "json"]},
+            {"id": 3, "command": "list", "args": ["-o", "json"]},
+        ]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli,
+                ["serve"],
+                input="".join(json.dumps(r) + "\n" for r in requests),
+            )
+        assert result.exit_code == 0
+        responses = [json.loads(r) for r in result.stdout.splitlines()]
+        assert [r["id"] for r in responses] == [1, 2, 3]
+        assert all(r["exit_code"] == 0 for r in responses)
+        assert len(json.loads(responses[0]["stdout"])) == 2
+        deleted = json.loads(responses[1]["stdout"])
+        assert self.find_dict_in_list(deleted, "name", "emoji_1") is not None
+        remaining = json.loads(responses[2]["stdout"])
+        assert [e["name"] for e in remaining] == ["emoji_2"]
+
+    def test_serve_errors(self) -> None:
+        # Setup
+        user = "user-1"
+        requests = [
+            "not json",
+            json.dumps({"command": "unknown"}),
+            json.dumps({"command": "delete", "args": ["absent_emoji"]}),
+            # The session cannot be changed by a request
+            json.dumps({"command": "list", "args": ["--url", "http://other"]}),
+        ]
+        # Test
+        with self.user_env(user), self.emoji_inventory([], user):
+            result = self.cli_runner.invoke(
+                cli, ["serve"], input="\n".join(requests) + "\n"
+            )
+        assert result.exit_code == 0
+        responses = [json.loads(r) for r in result.stdout.splitlines()]
+        assert [r["exit_code"] for r in responses] == [2, 1, 1, 2]
+        assert responses[2]["stderr"].split("\n")[-2] == (
+            'Error: Emoji "absent_emoji" does not exist'
+        )
+        assert responses[3]["stderr"].split("\n")[-2] == (
+            "Error: --url cannot be used within a session"
+        )
+
+    def test_serve_copy(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1"]
+        requests = [
+            {
+                "command": "copy",
+                "args": ["--from", self.api_url, "--to", self.api_url, "-n"],
+            },
+            {"command": "list", "args": ["-o", "json"]},
+        ]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli,
+                ["serve"],
+                input="".join(json.dumps(r) + "\n" for r in requests),
+            )
+        assert result.exit_code == 0
+        responses = [json.loads(r) for r in result.stdout.splitlines()]
+        # copy has its own sessions, the one of serve is left open
+        assert [r["exit_code"] for r in responses] == [0, 0]
+        assert [e["name"] for e in json.loads(responses[1]["stdout"])] == [
+            "emoji_1"
+        ]
+
+    def test_serve_unexpected_error(self, tmp_path: Path) -> None:
+        # Setup
+        user = "user-1"
+        requests = [
+            # The metrics cannot be written, which raises an OSError
+            {
+                "command": "list",
+                "args": ["--metrics-file", str(tmp_path / "absent/m.prom")],
+            },
+            {"command": "list", "args": ["-o", "json"]},
+        ]
+        # Test
+        with self.user_env(user), self.emoji_inventory([], user):
+            result = self.cli_runner.invoke(
+                cli,
+                ["serve"],
+                input="".join(json.dumps(r) + "\n" for r in requests),
+            )
+        assert result.exit_code == 0
+        responses = [json.loads(r) for r in result.stdout.splitlines()]
+        assert [r["exit_code"] for r in responses] == [1, 0]
+        error = responses[0]["stderr"].split("\n")[-2]
+        assert error.startswith("Error: [Errno 2]")
@@ -0,0 +1,65 @@
+import json
+import os
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from unittest.mock import _patch_dict
+
+import pytest
+from click.testing import CliRunner
+
+from mmemoji.cli import cli
+
+
+@pytest.mark.usefixtures("class_utils")
+class TestStats:
+    cli_runner: CliRunner
+    emoji_inventory: Callable[[list[str], str], AbstractContextManager[None]]
+    get_emoji_path: Callable[[str], str]
+    get_user_username: Callable[[str], str]
+    user_env: Callable[[str], _patch_dict]
+
+    def test_help(self) -> None:
+        result = self.cli_runner.invoke(cli, ["stats", "--help"])
+        assert result.exit_code == 0
+
+    def test_stats(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2", "emoji_3"]
+        sizes = {
+            name: os.path.getsize(self.get_emoji_path(name))
+            for name in emoji_names
+        }
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli, ["stats", "--top", "2", "-U", "-o", "json"]
+            )
+        assert result.exit_code == 0
+        stats = json.loads(result.stdout)
+        assert stats["count"] == len(emoji_names)
+        assert stats["size"] == sum(sizes.values())
+        assert stats["creators"][0]["count"] == len(emoji_names)
+        assert stats["creators"][0]["creator_username"] == (
+            self.get_user_username(user)
+        )
+        assert stats["formats"] == [
+            {"format": "png", "count": 3, "size": sum(sizes.values())}
+        ]
+        assert [e["size"] for e in stats["largest"]] == sorted(
+            sizes.values(), reverse=True
+        )[:2]
+
+    def test_stats_no_images(self) -> None:
+        # Setup
+        user = "user-1"
+        emoji_names = ["emoji_1", "emoji_2"]
+        # Test
+        with self.user_env(user), self.emoji_inventory(emoji_names, user):
+            result = self.cli_runner.invoke(
+                cli, ["stats", "--no-images", "-o", "json"]
+            )
+        assert result.exit_code == 0
+        stats = json.loads(result.stdout)
+        assert stats["count"] == len(emoji_names)
+        assert stats["formats"] == []
@@ -0,0 +1,53 @@
+import json
+import shutil
+import threading
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from pathlib import Path
+from unittest.mock import _patch_dict
+
+import pytest
+from click.testing import CliRunner
+
+from mmemoji.cli import cli
+
+
+@pytest.mark.usefixtures("class_utils")
+class TestWatch:
+    cli_runner: CliRunner
+    emoji_inventory: Callable[[list[str], str], AbstractContextManager[None]]
+    get_emoji_path: Callable[[str], str]
+    user_env: Callable[[str], _patch_dict]
+
+    def test_help(self) -> None:
+        result = self.cli_runner.invoke(cli, ["watch", "--help"])
+        assert result.exit_code == 0
+
+    @pytest.mark.parametrize("polling", [False, True])
+    def test_watch_emoji(self, tmp_path: Path, polling: bool) -> None:
+        # Setup
+        user = "user-1"
+        emoji_name = "emoji_1"
+
+        def drop_image() -> None:
+            time.sleep(1)
+            shutil.copy(self.get_emoji_path(emoji_name), tmp_path)
+
+        thread = threading.Thread(target=drop_image)
+        # Test
+        with self.user_env(user), self.emoji_inventory([], user):
+            thread.start()
+            result = self.cli_runner.invoke(
+                cli,
+                ["watch", str(tmp_path), "--debounce", "0.5", "--timeout", "4"]
+                + (["--polling", "--interval", "0.2"] if polling else [])
+                + ["-o", "json"],
+            )
+            thread.join()
+            result_list = self.cli_runner.invoke(cli, ["list", "-o", "json"])
+        assert result.exit_code == 0
+        emoji_list = json.loads(result.stdout)
+        assert [e["name"] for e in emoji_list] == [emoji_name]
+        emoji_list = json.loads(result_list.stdout)
+        assert [e["name"] for e in emoji_list] == [emoji_name]
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import click
+import pytest
+
+from mmemoji import completion
+
+URL = "http://localhost:8065"
+
+
+@pytest.fixture(autouse=True)
+def app_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(
+        completion.click, "get_app_dir", lambda name: str(tmp_path)
+    )
+    return tmp_path
+
+
+def test_cache_path_per_server() -> None:
+    assert completion.cache_path(URL) != completion.cache_path(
+        "https://chat.example.com"
+    )
+
+
+def test_read_missing_names() -> None:
+    names, age = completion.read_names(URL)
+    assert names == []
+    assert age == float("inf")
+
+
+def test_write_and_read_names() -> None:
+    completion.write_names(URL, ["emoji_2", "emoji_1"])
+    names, age = completion.read_names(URL)
+    assert names == ["emoji_1", "emoji_2"]
+    assert age < completion.CACHE_TTL
+
+
+def test_complete_emoji_names() -> None:
+    completion.write_names(URL, ["emoji_1", "emoji_2", "parrot"])
+    ctx = click.Context(click.Command("delete"))
+    ctx.params["url"] = URL
+    items = completion.complete_emoji_names(
+        ctx, click.Argument(["emoji_names"]), "emo"
+    )
+    assert [item.value for item in items] == ["emoji_1", "emoji_2"]
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from mattermostautodriver.exceptions import UnknownMattermostError
+
+from mmemoji.exceptions import EmojiNotFound
+from mmemoji.failures import FailureReport, describe, read_failures
+
+
+def test_describe() -> None:
+    emoji = MagicMock()
+    emoji.name = "emoji_1"
+    assert describe(EmojiNotFound(emoji)) == {
+        "exception": "EmojiNotFound",
+        "status": 404,
+        "error_id": None,
+        "error": 'Emoji "emoji_1" does not exist',
+    }
+    error = UnknownMattermostError("Bad gateway", 502, "", "", False)
+    assert describe(error)["status"] == 502
+    assert describe(OSError("failed"))["status"] is None
+
+
+def test_failure_report_keep_going(tmp_path: Path) -> None:
+    path = str(tmp_path / "failures.jsonl")
+    with FailureReport(path, "delete", keep_going=True) as report:
+        for item in ("emoji_1", "emoji_2", "emoji_3"):
+            with report.catch(item):
+                if item != "emoji_2":
+                    raise OSError(f"{item}: failed")
+    assert len(report) == 2
+    assert read_failures(path, "delete") == ["emoji_1", "emoji_3"]
+    assert read_failures(path, "create") == []
+    assert report.summary().splitlines() == [
+        "emoji_1: emoji_1: failed",
+        "emoji_3: emoji_3: failed",
+        f"2 emojis failed, retry them with --retry {path}",
+    ]
+
+
+def test_failure_report_stop(tmp_path: Path) -> None:
+    path = str(tmp_path / "failures.jsonl")
+    with (
+        pytest.raises(OSError, match="failed"),
+        FailureReport(path, "delete") as report,
+        report.catch("emoji_1"),
+    ):
+        raise OSError("failed")
+    assert read_failures(path, "delete") == ["emoji_1"]
+
+
+def test_failure_report_scopes(tmp_path: Path) -> None:
+    path = tmp_path / "failures.jsonl"
+    path.write_text(
+        json.dumps({"scope": "create", "item": "emoji_1.png"})
+        + "\n"
+        + json.dumps({"scope": "delete", "item": "emoji_1"})
+        + "\n{truncated"
+    )
+    # Failures of the scope are replaced, the others are kept
+    report = FailureReport(str(path), "delete", keep_going=True)
+    with report, report.catch("emoji_2"):
+        raise OSError("failed")
+    assert read_failures(str(path), "create") == ["emoji_1.png"]
+    assert read_failures(str(path), "delete") == ["emoji_2"]
+    assert read_failures(None, "delete") == []
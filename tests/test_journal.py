@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from mmemoji.journal import Journal
+
+
+def test_journal_without_file() -> None:
+    with Journal(None, "create") as journal:
+        journal.add("emoji_1")
+        assert "emoji_1" in journal
+
+
+def test_journal_resume(tmp_path: Path) -> None:
+    path = str(tmp_path / "journal")
+    with Journal(path, "create") as journal:
+        journal.add("emoji_1")
+        journal.add("emoji_2")
+    with Journal(path, "create") as journal:
+        assert "emoji_1" in journal
+        assert "emoji_2" in journal
+        assert "emoji_3" not in journal
+
+
+def test_journal_scope(tmp_path: Path) -> None:
+    path = str(tmp_path / "journal")
+    with Journal(path, "create") as journal:
+        journal.add("emoji_1")
+    with Journal(path, "delete") as journal:
+        assert "emoji_1" not in journal
+
+
+def test_journal_truncated_entry(tmp_path: Path) -> None:
+    path = tmp_path / "journal"
+    path.write_text(
+        json.dumps({"scope": "create", "item": "emoji_1"}) + '\n{"scope": "cr'
+    )
+    with Journal(str(path), "create") as journal:
+        assert "emoji_1" in journal
+
+
+def test_journal_invalid_entry(tmp_path: Path) -> None:
+    path = tmp_path / "journal"
+    path.write_text(
+        '["create", "emoji_2"]\n{"scope": "create"}\n'
+        + json.dumps({"scope": "create", "item": "emoji_1"})
+        + "\n"
+    )
+    with Journal(str(path), "create") as journal:
+        assert "emoji_1" in journal
+        assert "emoji_2" not in journal
+
+
+def test_journal_sync(tmp_path: Path) -> None:
+    path = tmp_path / "journal"
+    with Journal(str(path), "create", sync_every=2) as journal:
+        journal.add("emoji_1")
+        journal.add("emoji_2")
+        assert len(path.read_text().splitlines()) == 2
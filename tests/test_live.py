@@ -0,0 +1,188 @@
+import asyncio
+import json
+import queue
+import socket
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import WSMsgType, web
+from mattermostautodriver import TypedDriver as Mattermost
+
+from mmemoji.live import EmojiIndex, EmojiListener
+from mmemoji.registry import MetadataRegistry
+
+
+class FakeServer:
+    """Websocket server pushing the messages put in its queue"""
+
+    def __init__(self) -> None:
+        self.accepting = True
+        self.autoping = True
+        self.closing = False
+        self.tokens: list[str] = []
+        # Text messages, None drops the connection
+        self.messages: queue.Queue[str | None] = queue.Queue()
+        self.socket = socket.socket()
+        self.socket.bind(("127.0.0.1", 0))
+        self.port: int = self.socket.getsockname()[1]
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+
+    async def serve(self) -> None:
+        app = web.Application()
+        app.router.add_get("/api/v4/websocket", self.websocket)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.SockSite(runner, self.socket).start()
+        self.ready.set()
+        try:
+            while not self.stopped.is_set():
+                await asyncio.sleep(0.02)
+        finally:
+            self.closing = True
+            await runner.cleanup()
+
+    async def websocket(self, request: web.Request) -> web.StreamResponse:
+        if not self.accepting:
+            return web.Response(status=503)
+        ws = web.WebSocketResponse(autoping=self.autoping)
+        await ws.prepare(request)
+        challenge = await ws.receive_json()
+        self.tokens.append(challenge["data"]["token"])
+        await ws.send_json({"event": "hello", "seq": 0})
+        while not self.closing:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                try:
+                    # Answers the pings of the client if autoping
+                    received = await ws.receive(timeout=0.02)
+                except TimeoutError:
+                    continue
+                if received.type in (WSMsgType.CLOSE, WSMsgType.CLOSED):
+                    break
+                continue
+            if message is None:
+                break
+            await ws.send_str(message)
+        await ws.close()
+        return ws
+
+
+@pytest.fixture
+def fake_server() -> Iterator[FakeServer]:
+    server = FakeServer()
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(),))
+    thread.start()
+    server.ready.wait()
+    try:
+        yield server
+    finally:
+        server.stopped.set()
+        thread.join()
+
+
+def fake_driver(server: FakeServer, emojis: list[dict[str, Any]]) -> MagicMock:
+    driver = MagicMock()
+    driver.client.token = "token"
+    driver.options = Mattermost.default_options | {
+        "scheme": "http",
+        "url": "127.0.0.1",
+        "port": server.port,
+        "keepalive_delay": 0.05,
+    }
+    driver.emoji.get_emoji_list.side_effect = lambda page, per_page, sort: (
+        emojis[page * per_page : (page + 1) * per_page]
+    )
+    return driver
+
+
+def wait_for(predicate: Callable[[], bool], timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def emoji_added(metadata: dict[str, Any]) -> str:
+    return json.dumps(
+        {"event": "emoji_added", "data": {"emoji": json.dumps(metadata)}}
+    )
+
+
+def test_emoji_index_file(tmp_path: Path) -> None:
+    path = str(tmp_path / "index.json")
+    index = EmojiIndex(path)
+    index.add({"id": "1", "name": "emoji_1"})
+    index.save()
+    index = EmojiIndex(path)
+    assert index.names() == ["emoji_1"]
+    changed, removed = index.replace([{"id": "2", "name": "emoji_2"}])
+    assert changed == [{"id": "2", "name": "emoji_2"}]
+    assert removed == ["emoji_1"]
+
+
+def test_listener_emoji_added(fake_server: FakeServer) -> None:
+    emoji_1 = {"id": "1", "name": "emoji_1", "create_at": 1}
+    emoji_2 = {"id": "2", "name": "emoji_2", "create_at": 2}
+    driver = fake_driver(fake_server, [emoji_1])
+    registry = MetadataRegistry.for_driver(driver)
+    changes = []
+
+    def on_change(changed: list[dict[str, Any]], removed: list[str]) -> None:
+        changes.append(changed)
+
+    with EmojiListener(driver, on_change=on_change) as listener:
+        wait_for(lambda: listener.index.live)
+        assert registry.get("emoji_2") == {}
+        fake_server.messages.put(emoji_added(emoji_2))
+        wait_for(lambda: "emoji_2" in listener.index)
+        assert registry.get("emoji_2") == emoji_2
+    assert changes == [[emoji_1], [emoji_2]]
+    assert registry.index is None
+    assert fake_server.tokens == ["token"]
+
+
+def test_listener_resync_after_disconnect(fake_server: FakeServer) -> None:
+    emojis = [{"id": "1", "name": "emoji_1", "create_at": 1}]
+    driver = fake_driver(fake_server, emojis)
+    registry = MetadataRegistry.for_driver(driver)
+    with EmojiListener(driver, resync_interval=0.1) as listener:
+        listener.poll_interval = 0.05
+        wait_for(lambda: listener.index.live)
+        fake_server.accepting = False
+        fake_server.messages.put(None)
+        wait_for(lambda: not listener.connected.is_set())
+        assert registry.get("emoji_2") is None
+        # Deleted and created while disconnected
+        emojis[:] = [{"id": "2", "name": "emoji_2", "create_at": 2}]
+        wait_for(lambda: listener.index.names() == ["emoji_2"])
+        assert registry.get("emoji_1") == {}
+        fake_server.accepting = True
+        wait_for(lambda: listener.index.live)
+
+
+def test_listener_resync_while_connected(fake_server: FakeServer) -> None:
+    emojis = [{"id": "1", "name": "emoji_1", "create_at": 1}]
+    driver = fake_driver(fake_server, emojis)
+    with EmojiListener(driver, resync_interval=0.1) as listener:
+        listener.poll_interval = 0.05
+        wait_for(lambda: listener.index.live)
+        # Deletions are not pushed by the server
+        emojis.clear()
+        wait_for(lambda: listener.index.names() == [])
+        assert listener.connected.is_set()
+    assert len(fake_server.tokens) == 1
+
+
+def test_listener_reconnects_when_idle(fake_server: FakeServer) -> None:
+    driver = fake_driver(fake_server, [])
+    # The pings of the client are left unanswered
+    fake_server.autoping = False
+    with EmojiListener(driver, heartbeat=0.2):
+        wait_for(lambda: len(fake_server.tokens) >= 2)
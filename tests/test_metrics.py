@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import httpx
+
+from mmemoji.metrics import Metrics, endpoint
+
+
+def test_endpoint() -> None:
+    assert endpoint("/api/v4/emoji/name/parrot") == "/api/v4/emoji/name/{name}"
+    assert (
+        endpoint("/api/v4/emoji/abcdefghijklmnopqrstuvwxyz/image")
+        == "/api/v4/emoji/{id}/image"
+    )
+    assert endpoint("/api/v4/emoji") == "/api/v4/emoji"
+
+
+def test_metrics(tmp_path: Path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("absent"):
+            return httpx.Response(404)
+        return httpx.Response(
+            200, content=b"image", headers={"X-Ratelimit-Remaining": "9"}
+        )
+
+    metrics = Metrics("download")
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    metrics.instrument(client)
+    with client:
+        client.get("http://localhost/api/v4/emoji/name/parrot")
+        client.get("http://localhost/api/v4/emoji/name/absent")
+        client.post("http://localhost/api/v4/emoji", content=b"upload")
+    metrics.add_items("succeeded", 2)
+    metrics.finish(True)
+    path = tmp_path / "mmemoji.prom"
+    metrics.write(str(path))
+
+    lines = path.read_text().splitlines()
+    assert (
+        'mmemoji_requests_total{command="download",method="GET",'
+        'endpoint="/api/v4/emoji/name/{name}",status="200"} 1'
+    ) in lines
+    assert (
+        'mmemoji_requests_total{command="download",method="GET",'
+        'endpoint="/api/v4/emoji/name/{name}",status="404"} 1'
+    ) in lines
+    assert (
+        'mmemoji_request_duration_seconds_count{command="download",'
+        'method="GET",endpoint="/api/v4/emoji/name/{name}"} 2'
+    ) in lines
+    assert (
+        'mmemoji_request_duration_seconds_bucket{command="download",'
+        'method="POST",endpoint="/api/v4/emoji",le="+Inf"} 1'
+    ) in lines
+    assert 'mmemoji_items_total{command="download",outcome="succeeded"} 2' in (
+        lines
+    )
+    assert 'mmemoji_bytes_total{command="download",direction="sent"} 6' in (
+        lines
+    )
+    assert 'mmemoji_ratelimit_remaining{command="download"} 9' in lines
+    assert 'mmemoji_run_success{command="download"} 1' in lines
+
+
+def test_metrics_uninstrument() -> None:
+    metrics = Metrics("list")
+    client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200))
+    )
+    metrics.instrument(client)
+    with client:
+        client.get("http://localhost/api/v4/emoji")
+        metrics.uninstrument(client)
+        client.get("http://localhost/api/v4/emoji")
+    assert sum(metrics.requests.values()) == 1
+    assert client.event_hooks == {"request": [], "response": []}
@@ -0,0 +1,45 @@
+import pstats
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mmemoji.profiling import profile
+
+
+def busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profile_pstats(tmp_path: Path) -> None:
+    path = tmp_path / "mmemoji.prof"
+    with profile(str(path)):
+        busy(0.05)
+    stats = pstats.Stats(str(path)).get_stats_profile()
+    assert "busy" in stats.func_profiles
+
+
+def test_profile_collapsed(tmp_path: Path) -> None:
+    path = tmp_path / "mmemoji.folded"
+    with profile(str(path), "collapsed"):
+        worker = threading.Thread(target=busy, args=(0.2,), name="worker")
+        worker.start()
+        worker.join()
+    lines = path.read_text().splitlines()
+    assert lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    # Worker threads are sampled too
+    assert any(
+        line.startswith("worker;") and "busy (test_profiling.py:" in line
+        for line in lines
+    )
+
+
+def test_profile_memory(capsys: pytest.CaptureFixture[str]) -> None:
+    with profile(None, memory=True):
+        data = bytearray(10_000_000)
+    del data
+    assert "Peak memory: 10.0 MB" in capsys.readouterr().err
@@ -0,0 +1,64 @@
+import io
+import json
+import threading
+
+from mmemoji.progress import Progress, format_duration, format_size
+
+
+class TTY(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+def test_format_size() -> None:
+    assert format_size(512) == "512 B"
+    assert format_size(1234567) == "1.2 MB"
+
+
+def test_format_duration() -> None:
+    assert format_duration(65) == "01:05"
+    assert format_duration(3725) == "1:02:05"
+
+
+def test_progress_json_lines() -> None:
+    stderr = io.StringIO()
+    with Progress(3, "create", interval=0, file=stderr) as progress:
+        for _ in progress.track(range(3)):
+            progress.advance(0, 100)
+    lines = [json.loads(line) for line in stderr.getvalue().splitlines()]
+    # Every update is reported with a zero interval, then a final line
+    assert len(lines) == 7
+    assert lines[-1]["label"] == "create"
+    assert lines[-1]["done"] == 3
+    assert lines[-1]["total"] == 3
+    assert lines[-1]["bytes"] == 300
+    assert lines[-1]["eta"] == 0
+
+
+def test_progress_terminal() -> None:
+    stderr = TTY()
+    with Progress(2, "delete", file=stderr) as progress:
+        progress.advance()
+        progress.advance()
+    output = stderr.getvalue()
+    assert output.startswith("\rdelete  2/2  ")
+    assert output.endswith("\n")
+
+
+def test_progress_threads() -> None:
+    stderr = io.StringIO()
+    with Progress(None, file=stderr) as progress:
+        threads = [
+            threading.Thread(
+                target=lambda: [progress.advance(1, 10) for _ in range(100)]
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    status = json.loads(stderr.getvalue())
+    assert status["done"] == 800
+    assert status["bytes"] == 8000
+    assert status["eta"] is None
@@ -0,0 +1,57 @@
+import time
+
+from mattermostautodriver import TypedDriver as Mattermost
+
+from mmemoji.registry import MetadataRegistry
+
+
+def test_registry_unknown_emoji() -> None:
+    registry = MetadataRegistry()
+    assert registry.get("emoji_1") is None
+
+
+def test_registry_positive_and_negative_entries() -> None:
+    registry = MetadataRegistry()
+    registry.set("emoji_1", {"id": "1", "name": "emoji_1"})
+    registry.set("absent_emoji", {})
+    assert registry.get("emoji_1") == {"id": "1", "name": "emoji_1"}
+    assert registry.get("absent_emoji") == {}
+
+
+def test_registry_expiration() -> None:
+    registry = MetadataRegistry(ttl=0.01)
+    registry.set("emoji_1", {"id": "1", "name": "emoji_1"})
+    time.sleep(0.02)
+    assert registry.get("emoji_1") is None
+
+
+def test_registry_sweeps_expired_entries() -> None:
+    registry = MetadataRegistry(ttl=0.01)
+    registry.set("emoji_1", {"id": "1", "name": "emoji_1"})
+    time.sleep(0.02)
+    registry.set("emoji_2", {"id": "2", "name": "emoji_2"})
+    assert len(registry) == 1
+
+
+def test_registry_max_size() -> None:
+    registry = MetadataRegistry(max_size=2)
+    for i in range(1, 4):
+        registry.set(f"emoji_{i}", {"id": str(i), "name": f"emoji_{i}"})
+    assert len(registry) == 2
+    assert registry.get("emoji_1") is None
+    assert registry.get("emoji_3") == {"id": "3", "name": "emoji_3"}
+
+
+def test_registry_discard() -> None:
+    registry = MetadataRegistry()
+    registry.set("emoji_1", {"id": "1", "name": "emoji_1"})
+    registry.discard("emoji_1")
+    assert registry.get("emoji_1") is None
+
+
+def test_registry_for_driver() -> None:
+    driver_1 = Mattermost.__new__(Mattermost)
+    driver_2 = Mattermost.__new__(Mattermost)
+    registry = MetadataRegistry.for_driver(driver_1)
+    assert MetadataRegistry.for_driver(driver_1) is registry
+    assert MetadataRegistry.for_driver(driver_2) is not registry
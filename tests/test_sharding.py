@@ -0,0 +1,28 @@
+import itertools
+
+import click
+import pytest
+
+from mmemoji.decorators import parse_shard
+from mmemoji.sharding import in_shard, shard_index
+
+
+def test_shards_partition_names() -> None:
+    names = [f"emoji_{i}" for i in range(100)]
+    shards = [
+        [name for name in names if in_shard(name, (number, 3))]
+        for number in (1, 2, 3)
+    ]
+    assert sorted(itertools.chain.from_iterable(shards)) == sorted(names)
+    assert all(shards)
+
+
+def test_shard_of_path_and_name() -> None:
+    assert shard_index("images/emoji (1).png", 7) == shard_index("emoji_1", 7)
+    assert in_shard("emoji_1", None)
+
+
+@pytest.mark.parametrize("value", ["1", "0/2", "3/2", "a/b", "1/0"])
+def test_parse_invalid_shard(value: str) -> None:
+    with pytest.raises(click.BadParameter):
+        parse_shard(None, None, value)  # ty:ignore[invalid-argument-type]
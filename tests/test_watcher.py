@@ -0,0 +1,73 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mmemoji.watcher import (
+    InotifyWatcher,
+    PollingWatcher,
+    is_candidate,
+    open_watcher,
+    watch,
+)
+
+
+def write_later(directory: Path) -> threading.Thread:
+    def write() -> None:
+        time.sleep(0.2)
+        for i in range(3):
+            (directory / "emoji_1.png").write_bytes(b"x" * i)
+            time.sleep(0.05)
+        (directory / ".hidden.png").write_bytes(b"x")
+        (directory / "emoji_2.gif.part").write_bytes(b"x")
+        os.rename(directory / "emoji_2.gif.part", directory / "emoji_2.gif")
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    return thread
+
+
+def test_is_candidate() -> None:
+    assert is_candidate("emoji_1.png")
+    assert not is_candidate(".emoji_1.png")
+    assert not is_candidate("emoji_1.png.part")
+    assert not is_candidate("emoji_1.png~")
+
+
+@pytest.mark.parametrize("polling", [False, True])
+def test_watch(tmp_path: Path, polling: bool) -> None:
+    batches: list[list[str]] = []
+    (tmp_path / "existing.png").write_bytes(b"x")
+    thread = write_later(tmp_path)
+    watch(
+        str(tmp_path),
+        batches.append,
+        debounce=0.3,
+        interval=0.1,
+        polling=polling,
+        timeout=1.5,
+    )
+    thread.join()
+    # Bursts of writes are reported once
+    assert batches == [
+        [str(tmp_path / "emoji_1.png"), str(tmp_path / "emoji_2.gif")]
+    ]
+
+
+def test_polling_watcher(tmp_path: Path) -> None:
+    with PollingWatcher(str(tmp_path)) as watcher:
+        assert watcher.poll(0) == set()
+        (tmp_path / "emoji_1.png").write_bytes(b"x")
+        assert watcher.poll(0) == {"emoji_1.png"}
+        assert watcher.poll(0) == set()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="requires inotify")
+def test_open_watcher(tmp_path: Path) -> None:
+    with open_watcher(str(tmp_path)) as watcher:
+        assert isinstance(watcher, InotifyWatcher)
+    with open_watcher(str(tmp_path), polling=True) as watcher:
+        assert isinstance(watcher, PollingWatcher)